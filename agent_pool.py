@@ -0,0 +1,53 @@
+# agent_pool.py
+# Per-simulation agent pools for Indian Court Simulator
+
+import threading
+
+from llm_gateway import attach_gateway
+
+
+class AgentPool:
+    """
+    Holds one agent per key (e.g. per witness) and reuses it, so clients, personas
+    and conversation context stay warm. Keys without a seeded agent get one from
+    factory(key) on first use.
+    """
+    def __init__(self, factory, agents: dict = None):
+        self.factory = factory
+        self._agents = {key: attach_gateway(agent) for key, agent in (agents or {}).items()}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        agent = self._agents.get(key)
+        if agent is None:
+            with self._lock:
+                agent = self._agents.get(key)
+                if agent is None:
+                    agent = attach_gateway(self.factory(key))
+                    self._agents[key] = agent
+        return agent
+
+    def replace(self, key, agent):
+        """
+        Swap in a new agent for `key`, e.g. the copy a claimed speculation ran on.
+        """
+        with self._lock:
+            self._agents[key] = agent
+
+    def __contains__(self, key):
+        return key in self._agents
+
+    def __len__(self):
+        return len(self._agents)
+
+
+def get_agent_pool(owner, name: str, factory, seed: dict = None) -> AgentPool:
+    """
+    Return the named pool attached to `owner` (normally the simulation), so the
+    pool lives and dies with that simulation. `seed` supplies the agents the
+    owner already has, e.g. the simulation's configured witnesses.
+    """
+    pools = owner.__dict__.setdefault("_agent_pools", {})
+    if name not in pools:
+        pools[name] = AgentPool(factory, seed)
+    return pools[name]
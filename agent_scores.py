@@ -1,10 +1,18 @@
+import argparse
+import json
+import math
 import time
+import threading
 import traceback
-from nltk.translate.bleu_score import sentence_bleu
-from sklearn.metrics import f1_score
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
 import torch
+import torch.nn.functional as F
 from transformers import GPT2Tokenizer, GPT2LMHeadModel
 
+from batch_metrics import batch_scores
+from llm_gateway import attach_gateway
+
 # Import your agents
 from clerk_agent import ClerkAgent
 from defendant_agent import DefendantAgent
@@ -13,31 +21,104 @@ from lawyer_agent import LawyerAgent
 from plaintiff_agent import PlaintiffAgent
 from witness_agent import WitnessAgent
 
-# Load a small language model for perplexity calculation
-tokenizer = GPT2Tokenizer.from_pretrained("distilgpt2")
-model = GPT2LMHeadModel.from_pretrained("distilgpt2")
-model.eval()
+class PerplexityScorer:
+    """
+    Scores text perplexity with a small language model.
+    The model is loaded on first use and kept warm for the life of the process.
+    """
+    def __init__(self, model_name="distilgpt2", batch_size=16, max_length=512):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenizer = None
+        self.model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.model is not None:
+            return
+        with self._lock:
+            if self.model is not None:
+                return
+            tokenizer = GPT2Tokenizer.from_pretrained(self.model_name)
+            # GPT-2 has no padding token; padded positions are masked out anyway
+            tokenizer.pad_token = tokenizer.eos_token
+            model = GPT2LMHeadModel.from_pretrained(self.model_name)
+            model.eval()
+            self.tokenizer = tokenizer
+            self.model = model
+
+    def count_tokens(self, texts):
+        self._load()
+        return [len(ids) for ids in self.tokenizer(list(texts))["input_ids"]]
+
+    def score(self, text):
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts):
+        """
+        Return the perplexity of each text, running padded batches through the model.
+        Texts with fewer than two tokens have no defined perplexity and score NaN.
+        """
+        self._load()
+        scores = [float('nan')] * len(texts)
+        # Batch texts of similar length together to keep padding small
+        order = sorted((i for i, text in enumerate(texts) if text.strip()), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            encodings = self.tokenizer(
+                [texts[i] for i in indices],
+                return_tensors='pt',
+                padding=True,
+                truncation=True,
+                max_length=self.max_length
+            )
+            with torch.no_grad():
+                logits = self.model(**encodings).logits
+            labels = encodings["input_ids"][:, 1:]
+            mask = encodings["attention_mask"][:, 1:].float()
+            token_losses = F.cross_entropy(logits[:, :-1].transpose(1, 2), labels, reduction='none')
+            token_counts = mask.sum(dim=1)
+            mean_losses = (token_losses * mask).sum(dim=1) / token_counts.clamp(min=1)
+            for i, loss, count in zip(indices, torch.exp(mean_losses).tolist(), token_counts.tolist()):
+                if count > 0:
+                    scores[i] = loss
+        return scores
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+def get_perplexity_scorer():
+    """
+    Return the process-wide perplexity scorer.
+    """
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = PerplexityScorer()
+        return _scorer
 
 def calculate_perplexity(text):
-    encodings = tokenizer(text, return_tensors='pt')
-    with torch.no_grad():
-        outputs = model(**encodings, labels=encodings["input_ids"])
-    loss = outputs.loss
-    return torch.exp(loss).item()
+    return get_perplexity_scorer().score(text)
 
 # Setup agent instances
 judge_config = {"name": "Judge John Doe", "experience": "15 years", "specialization": "Civil Law"}
 lawyer_config = {"name": "Lawyer Jane Smith", "experience": "10 years", "specialization": "Contract Law"}
 witness_config = {"name": "Witness Alex Brown", "testimony": "I saw the defendant breach the contract on June 5th."}
 
-agents = {
-    "ClerkAgent": ClerkAgent(),
-    "DefendantAgent": DefendantAgent(),
-    "JudgeAgent": JudgeAgent(judge_config),
-    "LawyerAgent": LawyerAgent(lawyer_config),
-    "PlaintiffAgent": PlaintiffAgent(),
-    "WitnessAgent": WitnessAgent(witness_config)
-}
+def build_agents():
+    agents = {
+        "ClerkAgent": ClerkAgent(),
+        "DefendantAgent": DefendantAgent(),
+        "JudgeAgent": JudgeAgent(judge_config),
+        "LawyerAgent": LawyerAgent(lawyer_config),
+        "PlaintiffAgent": PlaintiffAgent(),
+        "WitnessAgent": WitnessAgent(witness_config)
+    }
+    for agent in agents.values():
+        attach_gateway(agent)
+    return agents
 
 # Mock test contexts and reference outputs
 test_contexts = {
@@ -58,59 +139,270 @@ expected_outputs = {
     "WitnessAgent": "I observed that the defendant failed to deliver the goods."
 }
 
-def simple_f1(reference: str, prediction: str) -> float:
-    ref_tokens = reference.lower().split()
-    pred_tokens = prediction.lower().split()
-    common = set(ref_tokens) & set(pred_tokens)
-    if not ref_tokens or not pred_tokens:
-        return 0.0
-    precision = len(common) / len(pred_tokens)
-    recall = len(common) / len(ref_tokens)
-    if precision + recall == 0:
-        return 0.0
-    return 2 * (precision * recall) / (precision + recall)
-
-# Evaluate each agent
-results = {}
-
-for name, agent in agents.items():
-    start = time.time()
-    try:
-        if name == "JudgeAgent":
-            response = agent.rule_on_objection(test_contexts[name])
-        elif name == "LawyerAgent":
-            response = agent.raise_objection(test_contexts[name])
-        elif name == "WitnessAgent":
-            response = agent.respond_to_question(test_contexts[name])
-        else:
-            response = agent.generate_response(test_contexts[name])
-        success = True
-    except Exception as e:
-        response = traceback.format_exc()
-        success = False
-    end = time.time()
-
-    reference = expected_outputs[name]
-    bleu = sentence_bleu([reference.split()], response.split())
-    f1 = simple_f1(reference, response)
-    perplexity = calculate_perplexity(response) if success else float('inf')
-
-    results[name] = {
-        "success": success,
-        "response": response,
-        "time_taken_sec": round(end - start, 4),
-        "bleu_score": round(bleu, 4),
-        "f1_score": round(f1, 4),
-        "perplexity": round(perplexity, 2)
+# Agent method exercised by each evaluation; anything else uses generate_response
+AGENT_METHODS = {
+    "JudgeAgent": "rule_on_objection",
+    "LawyerAgent": "raise_objection",
+    "WitnessAgent": "respond_to_question"
+}
+
+def build_eval_cases(contexts=test_contexts, references=expected_outputs):
+    """
+    Turn per-agent contexts and references into a flat list of evaluation cases.
+    A value may be a single context/reference or a list of them, paired by position.
+    """
+    cases = []
+    for name, agent_contexts in contexts.items():
+        agent_references = references[name]
+        if not isinstance(agent_contexts, list):
+            agent_contexts, agent_references = [agent_contexts], [agent_references]
+        for context, reference in zip(agent_contexts, agent_references):
+            cases.append({
+                "agent": name,
+                "method": AGENT_METHODS.get(name, "generate_response"),
+                "context": context,
+                "reference": reference
+            })
+    return cases
+
+class EvaluationRunner:
+    """
+    Runs agent calls concurrently with per-call timeouts and retries.
+    Results always come back in the same order as the cases.
+    """
+    def __init__(self, max_workers=8, timeout=60.0, retries=1, retry_backoff=0.5):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.wall_time_sec = 0.0
+
+    def run(self, agents, cases):
+        # Timed-out calls cannot be interrupted, so attempts get their own pool
+        # sized for stragglers and never hold up the next retry.
+        calls = ThreadPoolExecutor(max_workers=self.max_workers * (self.retries + 1))
+        start = self._run_start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as drivers:
+                return list(drivers.map(lambda case: self._run_case(calls, agents[case["agent"]], case), cases))
+        finally:
+            self.wall_time_sec = time.perf_counter() - start
+            calls.shutdown(wait=False, cancel_futures=True)
+
+    def _span(self, first_start):
+        # When the case started and finished, in seconds since the run began
+        return {
+            "started_sec": round(first_start - self._run_start, 4),
+            "finished_sec": round(time.perf_counter() - self._run_start, 4)
+        }
+
+    def _run_case(self, calls, agent, case):
+        error = None
+        first_start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                future = calls.submit(getattr(agent, case["method"]), case["context"])
+                response = future.result(timeout=self.timeout)
+                return {
+                    **case,
+                    "success": True,
+                    "response": response,
+                    "attempts": attempt + 1,
+                    "time_taken_sec": round(time.perf_counter() - start, 4),
+                    **self._span(first_start)
+                }
+            except FutureTimeout:
+                future.cancel()
+                error = f"Timed out after {self.timeout} sec"
+            except Exception:
+                error = traceback.format_exc()
+            if attempt < self.retries:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        return {
+            **case,
+            "success": False,
+            "response": error,
+            "attempts": self.retries + 1,
+            "time_taken_sec": round(time.perf_counter() - start, 4),
+            **self._span(first_start)
+        }
+
+def evaluate_agents(agents, cases=None, runner=None):
+    """
+    Run every evaluation case against its agent and score the responses.
+    Perplexity is computed for all successful responses in one batched pass.
+    """
+    cases = build_eval_cases() if cases is None else cases
+    runner = runner or EvaluationRunner()
+    results = runner.run(agents, cases)
+
+    scores = batch_scores([r["response"] for r in results], [r["reference"] for r in results])
+    for result, bleu, f1 in zip(results, scores["bleu"].tolist(), scores["f1"].tolist()):
+        result["bleu_score"] = round(bleu, 4)
+        result["f1_score"] = round(f1, 4)
+        result["perplexity"] = float('inf')
+
+    scored = [result for result in results if result["success"]]
+    perplexities = get_perplexity_scorer().score_batch([result["response"] for result in scored])
+    for result, perplexity in zip(scored, perplexities):
+        result["perplexity"] = round(perplexity, 2)
+
+    return results
+
+def load_dataset(path, agents=None):
+    """
+    Load evaluation cases from a JSONL file of {agent, method, context, reference} rows.
+    The method defaults to the agent's usual evaluation method. When `agents` is
+    given, rows naming an unknown agent or a method it lacks are rejected.
+    """
+    cases = []
+    with open(path, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            missing = {"agent", "context", "reference"} - row.keys()
+            if missing:
+                raise ValueError(f"{path}:{line_no}: missing fields {sorted(missing)}")
+            method = row.get("method") or AGENT_METHODS.get(row["agent"], "generate_response")
+            if agents is not None:
+                if row["agent"] not in agents:
+                    raise ValueError(f"{path}:{line_no}: unknown agent {row['agent']!r}")
+                if not callable(getattr(agents[row["agent"]], method, None)):
+                    raise ValueError(f"{path}:{line_no}: {row['agent']} has no method {method!r}")
+            cases.append({
+                "agent": row["agent"],
+                "method": method,
+                "context": row["context"],
+                "reference": row["reference"]
+            })
+    return cases
+
+def _mean(values):
+    values = [v for v in values if math.isfinite(v)]
+    return round(sum(values) / len(values), 4) if values else None
+
+def _active_span(results):
+    """
+    Seconds from the group's first call starting to its last call finishing.
+    """
+    if not all("started_sec" in r for r in results):
+        return None
+    return max(r["finished_sec"] for r in results) - min(r["started_sec"] for r in results)
+
+def _summarize_group(results, wall_time=None):
+    latencies = np.array([r["time_taken_sec"] for r in results if r["success"]])
+    scores = batch_scores([r["response"] for r in results], [r["reference"] for r in results])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).round(4).tolist() if latencies.size else (None,) * 3
+    # Groups run interleaved, so each group's throughput is over its own active span
+    span = _active_span(results) if wall_time is None else wall_time
+    return {
+        "calls": len(results),
+        "success_rate": round(sum(r["success"] for r in results) / len(results), 4),
+        "latency_p50_sec": p50,
+        "latency_p95_sec": p95,
+        "latency_p99_sec": p99,
+        "active_span_sec": round(span, 4) if span is not None else None,
+        "throughput_per_sec": round(len(results) / span, 4) if span else None,
+        "response_tokens": sum(r["response_tokens"] for r in results),
+        "bleu_score": _mean([r["bleu_score"] for r in results]),
+        "f1_score": _mean([r["f1_score"] for r in results]),
+        "corpus_bleu": round(scores["corpus_bleu"], 4),
+        "corpus_f1": round(scores["corpus_f1"], 4),
+        "perplexity": _mean([r["perplexity"] for r in results if r["success"]])
+    }
+
+def summarize_results(results, wall_time):
+    """
+    Aggregate latency percentiles, throughput, token counts and quality scores
+    overall, per agent and per agent method.
+    """
+    # Failed calls hold an error message, not a response, so they count no tokens
+    succeeded = [r for r in results if r["success"]]
+    for result in results:
+        result["response_tokens"] = 0
+    counts = get_perplexity_scorer().count_tokens(r["response"] for r in succeeded) if succeeded else []
+    for result, count in zip(succeeded, counts):
+        result["response_tokens"] = count
+    by_agent, by_method = {}, {}
+    for result in results:
+        by_agent.setdefault(result["agent"], []).append(result)
+        by_method.setdefault(f"{result['agent']}.{result['method']}", []).append(result)
+    return {
+        "wall_time_sec": round(wall_time, 4),
+        "overall": _summarize_group(results, wall_time) if results else {},
+        "agents": {name: _summarize_group(group) for name, group in by_agent.items()},
+        "methods": {name: _summarize_group(group) for name, group in by_method.items()}
     }
 
-# Print evaluation results
-print("\nDeep Evaluation Results:")
-for agent_name, result in results.items():
-    print(f"\nAgent: {agent_name}")
-    print(f"Success: {result['success']}")
-    print(f"Time Taken: {result['time_taken_sec']} sec")
-    print(f"BLEU Score: {result['bleu_score']}")
-    print(f"F1 Score: {result['f1_score']}")
-    print(f"Perplexity: {result['perplexity']}")
-    print(f"Response:\n{result['response']}")
+def _json_safe(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+def write_results(path, results, summary, run_info=None):
+    """
+    Write a benchmark run as JSON so runs can be diffed against each other.
+    """
+    with open(path, "w") as f:
+        json.dump(_json_safe({"run": run_info or {}, "summary": summary, "results": results}), f, indent=2, default=str)
+
+def print_summary(summary):
+    print("\nBenchmark Summary:")
+    print(f"Wall Time: {summary['wall_time_sec']} sec")
+    for name, stats in summary["methods"].items():
+        print(
+            f"{name}: calls={stats['calls']} success={stats['success_rate']} "
+            f"p50={stats['latency_p50_sec']}s p95={stats['latency_p95_sec']}s p99={stats['latency_p99_sec']}s "
+            f"throughput={stats['throughput_per_sec']}/s tokens={stats['response_tokens']} "
+            f"bleu={stats['bleu_score']} f1={stats['f1_score']} ppl={stats['perplexity']}"
+        )
+
+def print_results(results):
+    print("\nDeep Evaluation Results:")
+    for result in results:
+        print(f"\nAgent: {result['agent']} ({result['method']})")
+        print(f"Success: {result['success']}")
+        print(f"Attempts: {result['attempts']}")
+        print(f"Time Taken: {result['time_taken_sec']} sec")
+        print(f"BLEU Score: {result['bleu_score']}")
+        print(f"F1 Score: {result['f1_score']}")
+        print(f"Perplexity: {result['perplexity']}")
+        print(f"Response:\n{result['response']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evaluate courtroom agents")
+    parser.add_argument("--workers", type=int, default=8, help="Number of concurrent agent calls")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-call timeout in seconds")
+    parser.add_argument("--retries", type=int, default=1, help="Retries for failed or timed-out calls")
+    parser.add_argument("--dataset", action="append", help="JSONL dataset of evaluation cases (repeatable)")
+    parser.add_argument("--output", help="Write per-case results and the summary to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    runner = EvaluationRunner(max_workers=args.workers, timeout=args.timeout, retries=args.retries)
+    agents = build_agents()
+    cases = [case for path in args.dataset for case in load_dataset(path, agents)] if args.dataset else build_eval_cases()
+
+    results = evaluate_agents(agents, cases, runner)
+    summary = summarize_results(results, runner.wall_time_sec)
+
+    if not args.quiet:
+        print_results(results)
+    print_summary(summary)
+    if args.output:
+        run_info = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "datasets": args.dataset or [],
+            "workers": args.workers,
+            "timeout": args.timeout,
+            "retries": args.retries
+        }
+        write_results(args.output, results, summary, run_info)
@@ -0,0 +1,131 @@
+# agent_stream.py
+# Streaming agent output for Indian Court Simulator
+
+import queue
+import threading
+from types import SimpleNamespace
+
+from response_cache import ResponseCache, agent_cache_key
+
+
+def iter_completion_text(stream):
+    """
+    Yield the text deltas of a streamed Groq/OpenAI chat completion
+    (created with stream=True), skipping role-only and empty chunks.
+    """
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+class StreamingCompletions:
+    """
+    Stands in for client.chat.completions while an agent method runs. Each
+    request is made with stream=True and its text handed to `emit` as it
+    arrives; the agent still gets back an ordinary completion with the full text.
+    """
+    def __init__(self, completions, emit):
+        self.completions = completions
+        self.emit = emit
+
+    def create(self, **kwargs):
+        if kwargs.get("stream"):
+            return self.completions.create(**kwargs)
+        parts = []
+        for text in iter_completion_text(self.completions.create(**dict(kwargs, stream=True))):
+            parts.append(text)
+            self.emit(text)
+        return SimpleNamespace(
+            model=kwargs.get("model"),
+            choices=[SimpleNamespace(
+                message=SimpleNamespace(role="assistant", content="".join(parts)), finish_reason="stop"
+            )]
+        )
+
+
+def supports_streaming(agent, method: str) -> bool:
+    return callable(getattr(agent, f"stream_{method}", None))
+
+
+def streams_through_client(agent) -> bool:
+    """
+    Whether the agent calls its LLM through a Groq/OpenAI-shaped `client`.
+    """
+    return hasattr(getattr(getattr(agent, "client", None), "chat", None), "completions")
+
+
+def _stream_through_client(agent, method, args, kwargs):
+    """
+    Run agent.method on a worker thread with its client switched to streaming,
+    yielding the completion text as it arrives. Returns the method's result.
+    """
+    chunks = queue.Queue()
+    finished = object()
+    outcome = {}
+    client = agent.client
+    agent.client = SimpleNamespace(chat=SimpleNamespace(
+        completions=StreamingCompletions(client.chat.completions, chunks.put)
+    ))
+
+    def run():
+        try:
+            outcome["response"] = getattr(agent, method)(*args, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            agent.client = client
+            chunks.put(finished)
+
+    threading.Thread(target=run, daemon=True).start()
+    streamed = False
+    while True:
+        chunk = chunks.get()
+        if chunk is finished:
+            break
+        streamed = True
+        yield chunk
+    if "error" in outcome:
+        raise outcome["error"]
+    if not streamed:
+        # The method answered without calling the LLM
+        yield outcome["response"]
+    return outcome["response"]
+
+
+def stream_agent_call(agent, method: str, *args, cache: ResponseCache = None, case_id=None, **kwargs):
+    """
+    Yield an agent's reply in pieces as they are produced.
+
+    Agents can provide `stream_<method>` alongside `<method>`, yielding text
+    chunks with the same arguments. Otherwise an agent with a Groq/OpenAI-shaped
+    `client` runs `<method>` with that client streaming, and the completion text
+    is yielded token by token; the stored reply is still the method's return
+    value. Any other agent yields its whole reply as a single chunk. With a
+    cache, a cached reply is yielded at once and a fresh one is stored after the
+    stream completes.
+    """
+    key = None
+    if cache is not None:
+        key = agent_cache_key(cache, agent, method, args, kwargs, case_id)
+        found, value = cache.get(key)
+        if found:
+            yield value
+            return
+
+    if supports_streaming(agent, method):
+        chunks = []
+        for chunk in getattr(agent, f"stream_{method}")(*args, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+    elif streams_through_client(agent):
+        response = yield from _stream_through_client(agent, method, args, kwargs)
+    else:
+        response = getattr(agent, method)(*args, **kwargs)
+        yield response
+
+    if key is not None:
+        cache.set(key, response)
@@ -2,11 +2,46 @@
 # Animation utilities for Indian Court Simulator
 
 import streamlit as st
+import streamlit.components.v1 as components
+import json
 import time
 import random
 
+def script_json(value) -> str:
+    """
+    Serialize a value for embedding inside a <script> tag.
+    """
+    return json.dumps(value).replace("</", "<\\/")
+
+TYPEWRITER_SCRIPT = """
+<div id="entry" style="font-family:sans-serif;font-size:20px;">
+    <b id="speaker"></b> <span id="content"></span>
+</div>
+<script>
+    const entry = %(entry)s;
+    document.getElementById("speaker").textContent = entry.speaker + ":";
+    const target = document.getElementById("content");
+    let shown = 0;
+    function type() {
+        shown += 1;
+        target.textContent = entry.content.slice(0, shown);
+        if (shown < entry.content.length) {
+            setTimeout(type, 1000 / entry.charsPerSec);
+        }
+    }
+    setTimeout(type, entry.startAt * 1000);
+</script>
+"""
+
 class CourtroomAnimation:
-    def __init__(self):
+    """
+    Courtroom animations. In client-side mode (the default) each animation is
+    sent to the browser once and plays there, so the script thread never sleeps.
+    Server-side mode keeps the original blocking behaviour.
+    """
+    def __init__(self, client_side: bool = True, chars_per_sec: float = 1 / 0.03):
+        self.client_side = client_side
+        self.chars_per_sec = chars_per_sec
         self.animation_phases = {
             'opening': ('⚖️', 'Court in Session'),
             'examination': ('👨‍⚖️👨‍💼👩‍💼🧑‍💼', 'Witness Examination'),
@@ -27,28 +62,51 @@ class CourtroomAnimation:
         if phase in self.animation_phases:
             icon, label = self.animation_phases[phase]
             color = random.choice(self.colors)
+            # The fade-in runs in the browser for the same duration the server used to sleep
             st.markdown(f"""
-                <div style='text-align:center;font-size:48px;transition:all 0.5s;background:{color};padding:20px;border-radius:16px;'>
+                <style>@keyframes phaseIn {{ from {{ opacity: 0; transform: scale(0.9); }} to {{ opacity: 1; transform: scale(1); }} }}</style>
+                <div style='text-align:center;font-size:48px;transition:all 0.5s;background:{color};padding:20px;border-radius:16px;animation:phaseIn {duration}s ease-out;'>
                     {icon}<br><b>{label}</b>
                 </div>""", unsafe_allow_html=True)
-            time.sleep(duration)
+            if not self.client_side:
+                time.sleep(duration)
 
-    def animate_transcript_entry(self, speaker: str, content: str, delay: float = 0.5):
+    def animate_transcript_entry(self, speaker: str, content: str, delay: float = 0.5, start_at: float = 0.0):
         """
         Animate a transcript entry with a typewriter effect.
+        Client-side, the entry is sent once and typed by the browser, starting
+        `start_at` seconds after it arrives.
         """
+        if self.client_side:
+            entry = {"speaker": speaker, "content": content, "charsPerSec": self.chars_per_sec, "startAt": start_at}
+            # Rough height so long entries are not clipped by the component iframe
+            lines = len(content) // 90 + 1
+            components.html(TYPEWRITER_SCRIPT % {"entry": script_json(entry)}, height=40 + 28 * lines)
+            return
         st.write(f"**{speaker}:** ", unsafe_allow_html=True)
+        placeholder = st.empty()
         displayed = ""
         for char in content:
             displayed += char
-            st.markdown(f"<span style='font-size:20px;'>{displayed}</span>", unsafe_allow_html=True)
-            time.sleep(0.03)
+            placeholder.markdown(f"<span style='font-size:20px;'>{displayed}</span>", unsafe_allow_html=True)
+            time.sleep(1 / self.chars_per_sec)
         time.sleep(delay)
 
     def animate_case_progress(self, current: int, total: int):
         """
         Show a progress bar for the case phases.
         """
+        if self.client_side:
+            # Fill the bar, hold it, then fade it out, all in the browser
+            st.markdown(f"""
+                <style>
+                    @keyframes progressFill {{ from {{ width: 0; }} to {{ width: {100 * current / total:.1f}%; }} }}
+                    @keyframes progressHide {{ to {{ opacity: 0; height: 0; margin: 0; }} }}
+                </style>
+                <div style='background:#444;border-radius:8px;height:8px;margin:8px 0;animation:progressHide 0.3s ease-in 0.5s forwards;'>
+                    <div style='background:#e10600;height:8px;border-radius:8px;width:{100 * current / total:.1f}%;animation:progressFill 0.4s ease-out;'></div>
+                </div>""", unsafe_allow_html=True)
+            return
         progress = st.progress(current / total)
         time.sleep(0.5)
         progress.empty()
@@ -59,11 +117,152 @@ class CourtroomAnimation:
         """
         st.balloons()
 
+def compile_timeline(transcript: list, phases: list, chars_per_sec: float,
+                     phase_duration: float = 1.5, progress_duration: float = 0.5,
+                     entry_pause: float = 0.5) -> dict:
+    """
+    Compile a transcript into a playback timeline.
+    Returns phase segments and per-entry start/end offsets in seconds, plus the total duration.
+    """
+    timeline_phases = []
+    entries = []
+    clock = 0.0
+    current_phase = None
+    for entry in transcript:
+        phase = entry.get('phase', None)
+        if phase and phase != current_phase:
+            current_phase = phase
+            if timeline_phases:
+                timeline_phases[-1]['end'] = clock
+            timeline_phases.append({
+                'phase': phase,
+                'step': phases.index(phase) + 1 if phase in phases else None,
+                'start': clock,
+                'end': None
+            })
+            clock += phase_duration + progress_duration
+        typing = len(entry['content']) / chars_per_sec
+        entries.append({
+            'speaker': entry['speaker'],
+            'content': entry['content'],
+            'phase': current_phase,
+            'start': clock,
+            'end': clock + typing
+        })
+        clock += typing + entry_pause
+    if timeline_phases:
+        timeline_phases[-1]['end'] = clock
+    return {
+        'phases': timeline_phases,
+        'entries': entries,
+        'total_phases': len(phases),
+        'duration': clock
+    }
+
+REPLAY_PLAYER = """
+<div style="font-family:sans-serif;color:#fff;background:#000;padding:8px;">
+    <div style="display:flex;gap:8px;align-items:center;flex-wrap:wrap;">
+        <button id="play">Pause</button>
+        <input id="seek" type="range" min="0" step="0.1" style="flex:1;">
+        <span id="clock"></span>
+        <select id="speed">
+            <option value="0.5">0.5x</option><option value="1" selected>1x</option>
+            <option value="2">2x</option><option value="4">4x</option><option value="10">10x</option>
+        </select>
+    </div>
+    <div id="phases" style="display:flex;gap:4px;margin:8px 0;flex-wrap:wrap;"></div>
+    <div id="banner" style="text-align:center;font-size:28px;color:#e10600;min-height:36px;"></div>
+    <div style="background:#444;border-radius:8px;height:8px;margin-bottom:8px;">
+        <div id="progress" style="background:#e10600;height:8px;border-radius:8px;width:0;transition:width 0.4s;"></div>
+    </div>
+    <div id="entries" style="height:%(entries_height)dpx;overflow-y:auto;"></div>
+</div>
+<script>
+    const timeline = %(timeline)s;
+    const charsPerSec = %(chars_per_sec)s;
+    const seek = document.getElementById("seek");
+    const entriesBox = document.getElementById("entries");
+    const playButton = document.getElementById("play");
+    seek.max = timeline.duration;
+    let position = 0, speed = 1, playing = true, last = performance.now(), rendered = 0, typing = [];
+
+    function format(t) {
+        const s = Math.floor(t);
+        return Math.floor(s / 60) + ":" + String(s %% 60).padStart(2, "0");
+    }
+
+    timeline.phases.forEach(segment => {
+        const button = document.createElement("button");
+        button.textContent = segment.phase;
+        button.onclick = () => jump(segment.start);
+        document.getElementById("phases").appendChild(button);
+    });
+
+    function jump(t) {
+        position = Math.max(0, Math.min(t, timeline.duration));
+        entriesBox.innerHTML = "";
+        rendered = 0;
+        typing = [];
+        render();
+    }
+
+    function render() {
+        const segment = timeline.phases.filter(p => p.start <= position).pop();
+        document.getElementById("banner").textContent = segment ? segment.phase.toUpperCase() : "";
+        document.getElementById("progress").style.width =
+            segment && segment.step ? (100 * segment.step / timeline.total_phases) + "%%" : "0";
+        while (rendered < timeline.entries.length && timeline.entries[rendered].start <= position) {
+            const entry = timeline.entries[rendered];
+            const row = document.createElement("div");
+            row.style.cssText = "background:#181818;padding:10px;border-radius:6px;margin-bottom:6px;";
+            row.innerHTML = '<span style="color:#e10600;font-weight:bold;"></span> <span></span>';
+            row.children[0].textContent = entry.speaker + ":";
+            if (entry.end <= position) row.children[1].textContent = entry.content;
+            else typing.push(rendered);
+            entriesBox.appendChild(row);
+            rendered += 1;
+        }
+        // Only the entries still being typed need their text updated
+        typing = typing.filter(i => {
+            const entry = timeline.entries[i];
+            const shown = entry.end <= position ? entry.content.length : Math.floor((position - entry.start) * charsPerSec);
+            entriesBox.children[i].children[1].textContent = entry.content.slice(0, shown);
+            return entry.end > position;
+        });
+        if (rendered) entriesBox.scrollTop = entriesBox.scrollHeight;
+        seek.value = position;
+        document.getElementById("clock").textContent = format(position) + " / " + format(timeline.duration);
+    }
+
+    function tick(now) {
+        if (playing) {
+            position = Math.min(position + (now - last) / 1000 * speed, timeline.duration);
+            if (position >= timeline.duration) {
+                playing = false;
+                playButton.textContent = "Play";
+            }
+            render();
+        }
+        last = now;
+        requestAnimationFrame(tick);
+    }
+
+    playButton.onclick = () => {
+        if (!playing && position >= timeline.duration) jump(0);
+        playing = !playing;
+        playButton.textContent = playing ? "Pause" : "Play";
+    };
+    seek.oninput = () => jump(parseFloat(seek.value));
+    document.getElementById("speed").onchange = e => { speed = parseFloat(e.target.value); };
+    requestAnimationFrame(tick);
+</script>
+"""
+
 class CourtroomProceedingAnimation:
     """
     Defines and animates a full courtroom proceeding with phase transitions and transcript effects.
     """
-    def __init__(self):
+    def __init__(self, client_side: bool = True):
         self.phases = [
             'opening',
             'examination',
@@ -72,13 +271,32 @@ class CourtroomProceedingAnimation:
             'closing',
             'completed'
         ]
-        self.anim = CourtroomAnimation()
+        self.anim = CourtroomAnimation(client_side=client_side)
+
+    def compile(self, transcript: list) -> dict:
+        return compile_timeline(transcript, self.phases, self.anim.chars_per_sec)
+
+    def render_replay(self, transcript: list, height: int = 640):
+        """
+        Send the whole proceeding to the browser as one timeline, played back there
+        with play/pause, seek, speed control and skip-to-phase.
+        """
+        timeline = self.compile(transcript)
+        components.html(REPLAY_PLAYER % {
+            "timeline": script_json(timeline),
+            "chars_per_sec": self.anim.chars_per_sec,
+            "entries_height": height - 160
+        }, height=height)
 
     def animate_full_proceeding(self, transcript: list):
         """
         Animate the full courtroom proceeding with all phases and transcript entries.
         transcript: List of dicts with keys 'phase', 'speaker', 'content'.
         """
+        if self.anim.client_side:
+            self.render_replay(transcript)
+            self.anim.animate_confetti()
+            return
         current_phase = None
         total_phases = len(self.phases)
         for idx, entry in enumerate(transcript):
@@ -1,21 +1,33 @@
 import streamlit as st
 import json
 import os
-import time
 from datetime import datetime
 import numpy as np
 import matplotlib.pyplot as plt
 from PIL import Image
 import base64
 from io import BytesIO
+import threading
+from functools import lru_cache
+from matplotlib.figure import Figure
 
 from courtroom.simulation_manager import create_simulation, SimulationManager
 from agents.plaintiff_agent import PlaintiffAgent
 from agents.defendant_agent import DefendantAgent
 from agents.judge_agent import JudgeAgent
 from agents.witness_agent import WitnessAgent
-from utils.tts import TTSEngine
 from utils.stt import STTEngine
+from case_catalog import get_case_catalog, simulation_case_data
+from transcript_store import TranscriptStore
+from agent_stream import stream_agent_call
+from agent_pool import get_agent_pool
+from pacing import Pacer
+from tts_cache import CachedTTSEngine, play_in_browser
+from engine_pool import get_engine_pool
+from stt_stream import StreamingTranscriber
+from user_store import get_user_store
+from transcript_archive import get_transcript_archive
+from speculation import Speculator
 
 st.set_page_config(page_title="Lex Orion - Indian Court Simulator", page_icon="logo.jpeg", layout="wide")
 
@@ -202,18 +214,138 @@ st.markdown(
     </div>
     ''', unsafe_allow_html=True)
 
+# Transitions are paced according to PACING_MODE (server, client or production)
+pacer = Pacer()
+pacer.render_pending()
+
 # --- Animation Classes ---
+COURTROOM_CHARACTERS = {
+    "judge": (0.5, 0.15),
+    "plaintiff_lawyer": (0.2, 0.4),
+    "defendant_lawyer": (0.8, 0.4),
+    "witness": (0.5, 0.4),
+    "plaintiff": (0.1, 0.6),
+    "defendant": (0.9, 0.6),
+}
+
+SCENE_THEMES = {
+    "dark": {
+        "background": "black",
+        "furniture": "#333",
+        "audience": "#111",
+        "accent": "#e10600",
+        "text": "white",
+        "skin": "tan",
+    },
+}
+
+SCENE_PHASE_TITLES = {
+    'opening': "Opening Statements",
+    'examination': "Witness Examination",
+    'evidence': "Evidence Presentation",
+    'objection': "Objection Phase",
+    'closing': "Closing Arguments",
+    'judgment': "Judgment",
+    'completed': "Case Closed",
+}
+
+@lru_cache(maxsize=None)
+def render_courtroom_scene(phase, speaking_role=None, theme="dark"):
+    """Render a courtroom scene to PNG bytes.
+
+    Scenes only depend on (phase, speaking_role, theme), so each one is drawn
+    once per process and every later rerun is served from the cache.
+    """
+    colors = SCENE_THEMES[theme]
+    # Use the object-oriented API so renders never touch pyplot's global state
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+
+    # Draw courtroom background
+    ax.add_patch(plt.Rectangle((0, 0), 1, 1, color=colors["background"], alpha=1.0))
+
+    # Draw judge bench
+    ax.add_patch(plt.Rectangle((0.3, 0.05), 0.4, 0.1, color=colors["furniture"]))
+
+    # Draw witness stand
+    ax.add_patch(plt.Rectangle((0.45, 0.35), 0.1, 0.1, color=colors["furniture"]))
+
+    # Draw lawyers' tables
+    ax.add_patch(plt.Rectangle((0.1, 0.35), 0.2, 0.05, color=colors["furniture"]))
+    ax.add_patch(plt.Rectangle((0.7, 0.35), 0.2, 0.05, color=colors["furniture"]))
+
+    # Draw audience area
+    ax.add_patch(plt.Rectangle((0.1, 0.6), 0.8, 0.3, color=colors["audience"], alpha=0.9))
+
+    # Draw phase-specific elements
+    if phase in SCENE_PHASE_TITLES:
+        ax.text(0.5, 0.9, SCENE_PHASE_TITLES[phase], ha='center', fontsize=14, color=colors["text"],
+               bbox=dict(facecolor=colors["accent"], alpha=0.8, boxstyle='round'))
+    if phase == 'evidence':
+        ax.add_patch(plt.Rectangle((0.45, 0.45), 0.1, 0.05, color=colors["accent"], alpha=0.8))
+    elif phase == 'objection':
+        if speaking_role and 'lawyer' in speaking_role:
+            ax.text(0.5, 0.75, "OBJECTION!", ha='center', fontsize=16, color=colors["accent"], weight='bold',
+                   bbox=dict(facecolor=colors["text"], alpha=0.9, boxstyle='round,pad=0.5'))
+    elif phase == 'judgment':
+        ax.add_patch(plt.Rectangle((0.3, 0.02), 0.4, 0.13, color=colors["furniture"], linewidth=3, edgecolor=colors["accent"]))
+    elif phase == 'completed':
+        ax.text(0.5, 0.5, "JUSTICE SERVED", ha='center', fontsize=20, color=colors["accent"], weight='bold',
+               bbox=dict(facecolor=colors["background"], alpha=0.8, boxstyle='round,pad=0.5', edgecolor=colors["text"]))
+
+    # Draw characters
+    for role, (x, y) in COURTROOM_CHARACTERS.items():
+        # Body
+        color = colors["text"] if 'lawyer' in role else colors["accent"]
+        ax.add_patch(plt.Circle((x, y), 0.05, color=color))
+
+        # Head
+        ax.add_patch(plt.Circle((x, y-0.07), 0.03, color=colors["skin"]))
+
+        # Speech bubble if speaking
+        if role == speaking_role:
+            ax.annotate("Speaking", xy=(x, y-0.12),
+                        xytext=(x+0.15, y-0.15),
+                        arrowprops=dict(arrowstyle="->", color=colors["text"]),
+                        bbox=dict(boxstyle="round,pad=0.3", fc=colors["accent"], alpha=0.9))
+
+    ax.axis('off')
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+def prerender_courtroom_scenes(theme="dark"):
+    """Fill the scene cache for every phase and speaking role."""
+    for phase in SCENE_PHASE_TITLES:
+        render_courtroom_scene(phase, None, theme)
+        for role in COURTROOM_CHARACTERS:
+            render_courtroom_scene(phase, role, theme)
+
+@st.cache_resource(show_spinner=False)
+def start_scene_prerender(theme="dark"):
+    """Warm the scene cache once per process in the background."""
+    thread = threading.Thread(target=prerender_courtroom_scenes, args=(theme,), daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource(show_spinner=False)
+def start_prompt_presynthesis():
+    """Synthesize the fixed courtroom prompts once per process in the background."""
+    thread = threading.Thread(target=CachedTTSEngine().presynthesize, daemon=True)
+    thread.start()
+    return thread
+
 class CourtroomAnimation:
-    def __init__(self):
+    def __init__(self, theme="dark"):
         self.characters = {
-            "judge": {"position": (0.5, 0.15), "speaking": False},
-            "plaintiff_lawyer": {"position": (0.2, 0.4), "speaking": False},
-            "defendant_lawyer": {"position": (0.8, 0.4), "speaking": False},
-            "witness": {"position": (0.5, 0.4), "speaking": False},
-            "plaintiff": {"position": (0.1, 0.6), "speaking": False},
-            "defendant": {"position": (0.9, 0.6), "speaking": False},
+            role: {"position": position, "speaking": False}
+            for role, position in COURTROOM_CHARACTERS.items()
         }
-        self.courtroom_bg = self.create_courtroom_bg()
+        self.theme = theme
+        self.courtroom_bg = None
         self.current_speaker = None
         self.animation_frames = []
         self.animation_speed = 0.5
@@ -261,68 +393,8 @@ class CourtroomAnimation:
 
     def animate_phase(self, phase, speaking_role=None):
         """Animate the current phase of the trial"""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        
-        # Draw courtroom background - updated to black
-        ax.add_patch(plt.Rectangle((0, 0), 1, 1, color='black', alpha=1.0))
-        
-        # Draw judge bench
-        ax.add_patch(plt.Rectangle((0.3, 0.05), 0.4, 0.1, color='#333'))
-        
-        # Draw witness stand
-        ax.add_patch(plt.Rectangle((0.45, 0.35), 0.1, 0.1, color='#333'))
-        
-        # Draw lawyers' tables
-        ax.add_patch(plt.Rectangle((0.1, 0.35), 0.2, 0.05, color='#333'))
-        ax.add_patch(plt.Rectangle((0.7, 0.35), 0.2, 0.05, color='#333'))
-        
-        # Draw audience area
-        ax.add_patch(plt.Rectangle((0.1, 0.6), 0.8, 0.3, color='#111', alpha=0.9))
-        
-        # Draw phase-specific elements
-        if phase == 'opening':
-            ax.text(0.5, 0.9, "Opening Statements", ha='center', fontsize=14, color='white', 
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-        elif phase == 'examination':
-            ax.text(0.5, 0.9, "Witness Examination", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-        elif phase == 'evidence':
-            ax.text(0.5, 0.9, "Evidence Presentation", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-            ax.add_patch(plt.Rectangle((0.45, 0.45), 0.1, 0.05, color='#e10600', alpha=0.8))
-        elif phase == 'objection':
-            ax.text(0.5, 0.9, "Objection Phase", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-            if speaking_role and 'lawyer' in speaking_role.lower():
-                ax.text(0.5, 0.75, "OBJECTION!", ha='center', fontsize=16, color='#e10600', weight='bold',
-                       bbox=dict(facecolor='white', alpha=0.9, boxstyle='round,pad=0.5'))
-        elif phase == 'closing':
-            ax.text(0.5, 0.9, "Closing Arguments", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-        elif phase == 'judgment':
-            ax.text(0.5, 0.9, "Judgment", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-            ax.add_patch(plt.Rectangle((0.3, 0.02), 0.4, 0.13, color='#333', linewidth=3, edgecolor='#e10600'))
-        elif phase == 'completed':
-            ax.text(0.5, 0.9, "Case Closed", ha='center', fontsize=14, color='white',
-                   bbox=dict(facecolor='#e10600', alpha=0.8, boxstyle='round'))
-            ax.text(0.5, 0.5, "JUSTICE SERVED", ha='center', fontsize=20, color='#e10600', weight='bold',
-                   bbox=dict(facecolor='black', alpha=0.8, boxstyle='round,pad=0.5', edgecolor='white'))
-            
-        # Draw characters
-        for role, info in self.characters.items():
-            self.draw_character(ax, role, is_speaking=(role.lower() == speaking_role.lower() if speaking_role else False))
-            
-        ax.axis('off')
-        
-        # Convert plot to image for Streamlit
-        buf = BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        st.image(buf, use_column_width=True)
-        plt.close(fig)
+        speaking_role = speaking_role.lower() if speaking_role else None
+        st.image(render_courtroom_scene(phase, speaking_role, self.theme), use_column_width=True)
         
     def animate_confetti(self):
         """Display animated confetti for case completion"""
@@ -425,19 +497,17 @@ class CourtroomProceedingAnimation:
             st.write(f"Phase: {phase}")
 
 # --- Helper functions ---
+# Built-in login for this app only; never written to the shared user store
+DEFAULT_USERS = {"admin": "1234"}
+
 def load_users():
-    # Return a default user dict with admin/1234 if users.json is missing or removed
-    return {"admin": {"password": "1234", "transcripts": []}}
+    return get_user_store()
 
 def load_cases():
-    with open('data/cases.json', 'r') as f:
-        return json.load(f)["cases"]
+    return get_case_catalog().all()
 
 def get_case_by_id(case_id):
-    for case in load_cases():
-        if case["case_id"] == case_id:
-            return case
-    return None
+    return get_case_catalog().get(case_id)
 
 def get_speaker_role(role):
     """Convert UI role to character role for animation"""
@@ -449,15 +519,38 @@ def get_speaker_role(role):
     }
     return mapping.get(role, None)
 
+TRANSCRIPT_PAGE_SIZE = 50
+
+def get_transcript_entry_html(index, entry):
+    """Return the rendered HTML for a transcript entry, cached by its index"""
+    cache = st.session_state.setdefault('transcript_html', {})
+    if index not in cache:
+        # Ensure entry is a dictionary and has 'speaker' key
+        if isinstance(entry, dict) and 'speaker' in entry:
+            # Use a dark background for transcript entries for contrast
+            cache[index] = f"""
+            <div style="background:#181818;padding:10px;border-radius:6px;margin-bottom:6px;">
+                <span style="color:#e10600;font-weight:bold;">{entry['speaker']}:</span>
+                <span style="color:#fff;">{entry['content']}</span>
+            </div>
+            """
+        else:
+            cache[index] = ""
+    return cache[index]
+
 # --- Streamlit App ---
 
 # Initialize TTS and STT engines
+start_prompt_presynthesis()
 if 'tts_engine' not in st.session_state:
-    st.session_state.tts_engine = TTSEngine()
+    # Speech is synthesized into the shared audio cache and played from it; no TTSEngine is needed
+    st.session_state.tts_engine = CachedTTSEngine()
 if 'stt_engine' not in st.session_state:
-    st.session_state.stt_engine = STTEngine()
+    # Recordings last as long as the speaker talks, so STT calls have no time limit
+    st.session_state.stt_engine = get_engine_pool("stt", STTEngine, call_timeout=0).proxy()
 
 # Initialize animations
+start_scene_prerender()
 if 'courtroom_anim' not in st.session_state:
     st.session_state.courtroom_anim = CourtroomAnimation()
 if 'proceeding_anim' not in st.session_state:
@@ -476,17 +569,16 @@ if not st.session_state.logged_in:
         password = st.text_input("Password", type="password")
         if st.button("Login"):
             users = load_users()
-            if username == "admin" and password == "1234":
+            if DEFAULT_USERS.get(username) == password or users.authenticate(username, password):
                 st.session_state.logged_in = True
                 st.session_state.username = username
                 # Add animation for successful login
-                st.markdown("""
+                pacer.transition("""
                 <div style="text-align:center; animation: fadeIn 1s;">
                     <h3 style="color: green;">Login Successful!</h3>
                     <p>Welcome to the Indian Court Simulator</p>
                 </div>
-                """, unsafe_allow_html=True)
-                time.sleep(1)  # Short delay for animation effect
+                """, 1)
                 st.rerun()
             else:
                 st.error("Invalid username or password.")
@@ -559,32 +651,19 @@ if not st.session_state.selected_role:
     if st.button("Confirm Role"):
         st.session_state.selected_role = role
         # Animation for role confirmation
-        st.markdown(f"""
+        pacer.transition(f"""
         <div style="text-align:center; animation: fadeIn 1s;">
             <h3 style="color:#e10600;">You selected: {role}</h3>
             <p style="color:#fff;">Preparing the courtroom...</p>
         </div>
-        """, unsafe_allow_html=True)
-        time.sleep(1)  # Short delay for animation effect
+        """, 1)
         st.rerun()
     st.stop()
 
 # --- Simulation Setup ---
 if 'simulation' not in st.session_state:
     # Prepare case_data for simulation manager
-    case_data = {
-        "case_id": case["case_id"],
-        "title": case["title"],
-        "type": case["case_type"],
-        "plaintiff": case["parties"]["plaintiff"],
-        "defendant": case["parties"]["defendant"],
-        "description": case["description"],
-        "judge_data": {"name": "Justice Rao", "experience": "20 years", "specialization": "Civil Law"},
-        "plaintiff_lawyer_data": {"name": "Adv. Mehta", "experience": "15 years", "specialization": "Contracts"},
-        "defendant_lawyer_data": {"name": "Adv. Singh", "experience": "12 years", "specialization": "Contracts"},
-        "witnesses": case["witnesses"],
-        "evidence": case["evidence"]
-    }
+    case_data = simulation_case_data(case)
     st.session_state.simulation = create_simulation(case_data)
     st.session_state.simulation_state = 'not_started'
     st.session_state.transcript = []
@@ -638,6 +717,42 @@ phases = [
 ]
 phase = st.session_state.current_phase
 
+def sync_transcript():
+    """Pull new simulation transcript entries into the indexed transcript store"""
+    store = st.session_state.setdefault('transcript_store', TranscriptStore())
+    store.sync(sim.get_state()['transcript'], st.session_state.current_phase)
+    return store
+
+def add_to_transcript(speaker, content):
+    """Record a transcript entry and index it once, as it is written"""
+    sim.add_to_transcript(speaker, content)
+    return sync_transcript()
+
+def get_witness_pool():
+    """The simulation's configured witness agents, reused for the whole trial"""
+    configs = {w['name']: w for w in case['witnesses']}
+    seed = {agent.config.get('name', wid): agent for wid, agent in getattr(sim, 'witnesses', {}).items()}
+    return get_agent_pool(sim, "witnesses", lambda key: WitnessAgent(configs[key]), seed=seed)
+
+def record_speech(prompt):
+    """Speak the prompt, then transcribe the reply while it is being spoken"""
+    st.session_state.tts_engine.speak(prompt)
+    try:
+        transcriber = StreamingTranscriber.from_microphone()
+    except ImportError:
+        return st.session_state.stt_engine.process_microphone_input()
+    live = st.empty()
+    for partial in transcriber.partials():
+        live.markdown(f"*{partial}*")
+    live.empty()
+    text = transcriber.result()
+    if not text and transcriber.error is not None:
+        # No microphone stream here; fall back to the engine's blocking capture
+        text = st.session_state.stt_engine.process_microphone_input()
+    return text
+
+transcript_store = sync_transcript()
+
 # Header with phase indicator
 st.markdown(f"""
 <div class="phase-transition">
@@ -657,19 +772,20 @@ st.session_state.proceeding_anim.animate_phase(phase, st.session_state.selected_
 
 # Transcript in expandable section
 with st.expander("Court Transcript", expanded=True):
-    transcript = sim.get_state().get('transcript', [])
+    transcript = transcript_store.entries
     if transcript:
-        for entry in transcript:
-            # Ensure entry is a dictionary and has 'speaker' key
-            if isinstance(entry, dict) and 'speaker' in entry:
-                # Display all entries regardless of the user's role
-                # Use a dark background for transcript entries for contrast
-                st.markdown(f"""
-                <div style="background:#181818;padding:10px;border-radius:6px;margin-bottom:6px;">
-                    <span style="color:#e10600;font-weight:bold;">{entry['speaker']}:</span>
-                    <span style="color:#fff;">{entry['content']}</span>
-                </div>
-                """, unsafe_allow_html=True)
+        # Only the newest entries are rendered; older ones are loaded on demand
+        window = st.session_state.setdefault('transcript_window', TRANSCRIPT_PAGE_SIZE)
+        start = max(0, len(transcript) - window)
+        if start > 0:
+            if st.button(f"Load earlier entries ({start} hidden)", key="load_earlier_transcript"):
+                st.session_state.transcript_window = window + TRANSCRIPT_PAGE_SIZE
+                st.rerun()
+        # Display all entries regardless of the user's role, as a single block
+        st.markdown(
+            "".join(get_transcript_entry_html(i, transcript[i]) for i in range(start, len(transcript))),
+            unsafe_allow_html=True
+        )
     else:
         st.info("The court transcript will appear here as the case proceeds.")
 
@@ -732,8 +848,7 @@ if phase == 'opening':
         with col1:
             if st.button("Record Statement"):
                 with st.spinner("Recording..."):
-                    st.session_state.tts_engine.speak("Please deliver your opening statement.")
-                    user_input = st.session_state.stt_engine.process_microphone_input()
+                    user_input = record_speech("Please deliver your opening statement.")
                     st.success(f"Recorded: {user_input}")
         with col2:
             if st.button("Submit Opening Statement", key="submit_opening"):
@@ -741,15 +856,14 @@ if phase == 'opening':
                     # Set current speaker for animation
                     st.session_state.current_speaker = role_for_animation
                     # Add to transcript with animated effect
-                    sim.add_to_transcript(role, user_input)
+                    add_to_transcript(role, user_input)
                     
                     # Animate the speech
-                    st.markdown(f"""
+                    pacer.transition(f"""
                     <div style="padding: 10px; background-color: #000; border-radius: 5px; border: 1px solid #e10600;">
                         <strong style="color: #e10600;">{role}:</strong> <span style="color: #fff;">{user_input[:50]}...</span>
                     </div>
-                    """, unsafe_allow_html=True)
-                    time.sleep(1)  # Short delay for animation effect
+                    """, 1)
                     
                     st.session_state.current_phase = 'examination'
                     st.rerun()
@@ -787,15 +901,30 @@ elif phase == 'examination':
                 </div>
                 """, unsafe_allow_html=True)
         
-        witness_choice = st.selectbox("Choose a witness to examine", witness_names)
-        question = st.text_area("Enter your question for the witness:")
+        if 'speculator' not in st.session_state:
+            st.session_state.speculator = Speculator()
+        speculator = st.session_state.speculator
+        witness_pool = get_witness_pool()
+
+        def speculate_answer():
+            """Start on the witness's answer as soon as the question is entered, before Ask is clicked"""
+            witness = st.session_state.get('examination_witness')
+            entered = st.session_state.get('examination_question')
+            if witness and entered:
+                speculator.speculate(witness_pool.get(witness), "respond_to_question", witness, entered)
+
+        witness_choice = st.selectbox("Choose a witness to examine", witness_names,
+                                      key="examination_witness", on_change=speculate_answer)
+        question = st.text_input("Enter your question for the witness:", key="examination_question",
+                                 on_change=speculate_answer,
+                                 help="Press Enter when done and the witness starts on an answer right away.")
+        witness_agent = witness_pool.get(witness_choice)
         
         col1, col2 = st.columns([1, 3])
         with col1:
             if st.button("Record Question"):
                 with st.spinner("Recording..."):
-                    st.session_state.tts_engine.speak("Please ask your question.")
-                    question = st.session_state.stt_engine.process_microphone_input()
+                    question = record_speech("Please ask your question.")
                     st.success(f"Recorded: {question}")
         with col2:
             if st.button("Ask Question", key="ask_question"):
@@ -803,22 +932,39 @@ elif phase == 'examination':
                     # Set current speaker for animation
                     st.session_state.current_speaker = role_for_animation
                     # Add to transcript
-                    sim.add_to_transcript(role, f"Question to {witness_choice}: {question}")
-                    
-                    # Use agent to generate witness response
-                    witness_agent = WitnessAgent()
-                    response = witness_agent.respond_to_question(witness_choice, question)
+                    add_to_transcript(role, f"Question to {witness_choice}: {question}")
                     
                     # Update current speaker for animation
                     st.session_state.current_speaker = "witness"
+                    # Show the answer as it is generated; a matching speculation is already under way
+                    st.markdown(f"<span style='color:#e10600;font-weight:bold;'>Witness ({witness_choice}):</span>", unsafe_allow_html=True)
+                    answer_box = st.empty()
+                    answered = False
+                    speculation = speculator.claim(witness_agent, "respond_to_question", witness_choice, question)
+                    if speculation:
+                        try:
+                            with answer_box:
+                                response = st.write_stream(speculation.stream(timeout=120))
+                            # The copy it ran on now holds this question and answer
+                            witness_pool.replace(witness_choice, speculation.agent)
+                            answered = True
+                        except Exception:
+                            # The original agent is untouched, so ask it directly instead
+                            pass
+                    if not answered:
+                        # Answers depend on the testimony so far, so they are never cached
+                        with answer_box:
+                            response = st.write_stream(stream_agent_call(
+                                witness_agent, "respond_to_question", witness_choice, question
+                            ))
                     # Add witness response to transcript
-                    sim.add_to_transcript(f"Witness ({witness_choice})", response)
+                    add_to_transcript(f"Witness ({witness_choice})", response)
                     
                     # Add fake opposition response if user is defendant lawyer
                     if role == "Defendant Lawyer" and np.random.random() < 0.7:  # 70% chance to respond
-                        time.sleep(0.5)  # Short delay
+                        pacer.pause(0.5)  # Short delay
                         opposition_response = generate_fake_responses("question", question)
-                        sim.add_to_transcript("Plaintiff Lawyer", opposition_response)
+                        add_to_transcript("Plaintiff Lawyer", opposition_response)
                     
                     st.rerun()
                 else:
@@ -832,7 +978,7 @@ elif phase == 'examination':
     elif role == "Judge":
         st.info("You are overseeing the witness examination. You may interrupt if necessary.")
         if st.button("Order Witness to Answer"):
-            sim.add_to_transcript("Judge", "The witness is directed to answer the question.")
+            add_to_transcript("Judge", "The witness is directed to answer the question.")
             st.rerun()
         if st.button("Move to Evidence Phase"):
             st.session_state.current_phase = 'evidence'
@@ -847,9 +993,8 @@ elif phase == 'examination':
         """, unsafe_allow_html=True)
         
         # Check if there's a question waiting for this witness
-        latest_entries = sim.get_state()['transcript'][-3:] if len(sim.get_state()['transcript']) >= 3 else sim.get_state()['transcript']
-        for entry in latest_entries:
-            if 'Question to' in entry['content'] and role == "Witness":
+        for entry in transcript_store.recent('question', 3):
+            if role == "Witness":
                 st.markdown(f"""
                 <div style="padding: 10px; background-color: #111; border-radius: 5px; border: 1px solid #fff;">
                     <strong style="color: #e10600;">Question:</strong> <span style="color: #fff;">{entry['content'].split(': ')[1]}</span>
@@ -861,15 +1006,14 @@ elif phase == 'examination':
                 with col1:
                     if st.button("Record Testimony"):
                         with st.spinner("Recording..."):
-                            st.session_state.tts_engine.speak("Please provide your testimony.")
-                            answer = st.session_state.stt_engine.process_microphone_input()
+                            answer = record_speech("Please provide your testimony.")
                             st.success(f"Recorded: {answer}")
                 with col2:
                     if st.button("Submit Testimony"):
                         if answer:
                             # Set current speaker for animation
                             st.session_state.current_speaker = "witness"
-                            sim.add_to_transcript("Witness", answer)
+                            add_to_transcript("Witness", answer)
                             st.rerun()
                         else:
                             st.warning("Please enter your testimony before submitting.")
@@ -903,8 +1047,7 @@ elif phase == 'evidence':
         with col1:
             if st.button("Record Explanation"):
                 with st.spinner("Recording..."):
-                    st.session_state.tts_engine.speak("Please explain the significance of this evidence.")
-                    explanation = st.session_state.stt_engine.process_microphone_input()
+                    explanation = record_speech("Please explain the significance of this evidence.")
                     st.success(f"Recorded: {explanation}")
         with col2:
             if st.button("Present Evidence", key="present_evidence"):
@@ -920,17 +1063,17 @@ elif phase == 'evidence':
                     
                     if selected_evidence:
                         # Animate evidence presentation
-                        st.markdown(f"""
+                        pacer.transition(f"""
                         <div style="padding: 15px; background-color: #000; border-radius: 5px; 
                                 animation: scaleIn 1s; border: 2px solid #e10600;">
                             <h4 style="color: #e10600;">Evidence Presented: {selected_evidence['title']}</h4>
                             <p><strong style="color: #fff;">Type:</strong> <span style="color: #fff;">{selected_evidence['type']}</span></p>
                             <p><strong style="color: #fff;">Description:</strong> <span style="color: #fff;">{selected_evidence['description']}</span></p>
                         </div>
-                        """, unsafe_allow_html=True)
+                        """, 1)
                         
                         # Add to transcript
-                        sim.add_to_transcript(role, f"Presenting evidence: {selected_evidence['title']} - {explanation}")
+                        add_to_transcript(role, f"Presenting evidence: {selected_evidence['title']} - {explanation}")
                         
                         # Add to presented evidence list
                         if selected_evidence not in st.session_state.evidence_presented:
@@ -938,11 +1081,10 @@ elif phase == 'evidence':
                         
                         # Add fake opposition response if user is defendant lawyer
                         if role == "Defendant Lawyer" and np.random.random() < 0.7:  # 70% chance to respond
-                            time.sleep(1)  # Short delay for animation effect
+                            pacer.pause(1)  # Short delay for animation effect
                             opposition_response = generate_fake_responses("evidence", explanation)
-                            sim.add_to_transcript("Plaintiff Lawyer", opposition_response)
+                            add_to_transcript("Plaintiff Lawyer", opposition_response)
                         
-                        time.sleep(1)  # Short delay for animation effect
                         st.rerun()
                 else:
                     st.warning("Please select evidence and provide an explanation.")
@@ -955,7 +1097,7 @@ elif phase == 'evidence':
     elif role == "Judge":
         st.info("You are overseeing the evidence presentation. You may comment on the admissibility of evidence.")
         if st.button("Question Evidence Relevance"):
-            sim.add_to_transcript("Judge", "The court questions the relevance of this evidence. Please explain further.")
+            add_to_transcript("Judge", "The court questions the relevance of this evidence. Please explain further.")
             st.rerun()
         if st.button("Move to Closing Arguments"):
             st.session_state.current_phase = 'closing'
@@ -989,16 +1131,15 @@ elif phase == 'objection':
         if st.button("Raise Objection", key="raise_objection"):
             if objection_details:
                 # Dramatic animation for objection
-                st.markdown("""
+                pacer.transition("""
                 <div style="text-align:center; animation: scaleIn 0.5s;">
                     <h2 style="color:#e10600; font-weight:bold; text-shadow: 0 0 10px #fff;">OBJECTION!</h2>
                 </div>
-                """, unsafe_allow_html=True)
+                """, 1)
                 
                 # Set current speaker for animation
                 st.session_state.current_speaker = role_for_animation
-                sim.add_to_transcript(role, f"Objection! {objection_reason}: {objection_details}")
-                time.sleep(1)  # Short delay for animation effect
+                add_to_transcript(role, f"Objection! {objection_reason}: {objection_details}")
                 st.rerun()
             else:
                 st.warning("Please explain your objection before submitting.")
@@ -1011,53 +1152,49 @@ elif phase == 'objection':
         </div>
         """, unsafe_allow_html=True)
         
-        latest_entries = sim.get_state()['transcript'][-3:] if len(sim.get_state()['transcript']) >= 3 else sim.get_state()['transcript']
         objection_found = False
         
-        for entry in latest_entries:
-            if 'Objection!' in entry['content']:
-                objection_found = True
-                st.markdown(f"""
-                <div style="padding: 10px; background-color: #111; border-radius: 5px; border: 1px solid #e10600;">
-                    <strong style="color: #e10600;">{entry['speaker']}:</strong> <span style="color: #fff;">{entry['content']}</span>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("Sustain Objection"):
-                        # Set current speaker for animation
-                        st.session_state.current_speaker = "judge"
-                        sim.add_to_transcript("Judge", "Objection sustained.")
-                        
-                        # Animation for ruling
-                        st.markdown("""
-                        <div style="text-align: center; padding: 15px;">
-                            <span style="font-size: 30px;">🔨</span>
-                            <h3 style="color: #e10600;">Sustained</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        time.sleep(1)  # Short delay for animation effect
-                        st.session_state.current_phase = 'evidence'
-                        st.rerun()
-                with col2:
-                    if st.button("Overrule Objection"):
-                        # Set current speaker for animation
-                        st.session_state.current_speaker = "judge"
-                        sim.add_to_transcript("Judge", "Objection overruled. Please continue.")
-                        
-                        # Animation for ruling
-                        st.markdown("""
-                        <div style="text-align: center; padding: 15px;">
-                            <span style="font-size: 30px;">🔨</span>
-                            <h3 style="color: #e10600;">Overruled</h3>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        time.sleep(1)  # Short delay for animation effect
-                        st.session_state.current_phase = 'evidence'
-                        st.rerun()
+        for entry in transcript_store.recent('objection', 3):
+            objection_found = True
+            st.markdown(f"""
+            <div style="padding: 10px; background-color: #111; border-radius: 5px; border: 1px solid #e10600;">
+                <strong style="color: #e10600;">{entry['speaker']}:</strong> <span style="color: #fff;">{entry['content']}</span>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Sustain Objection"):
+                    # Set current speaker for animation
+                    st.session_state.current_speaker = "judge"
+                    add_to_transcript("Judge", "Objection sustained.")
+                    
+                    # Animation for ruling
+                    pacer.transition("""
+                    <div style="text-align: center; padding: 15px;">
+                        <span style="font-size: 30px;">🔨</span>
+                        <h3 style="color: #e10600;">Sustained</h3>
+                    </div>
+                    """, 1)
+                    
+                    st.session_state.current_phase = 'evidence'
+                    st.rerun()
+            with col2:
+                if st.button("Overrule Objection"):
+                    # Set current speaker for animation
+                    st.session_state.current_speaker = "judge"
+                    add_to_transcript("Judge", "Objection overruled. Please continue.")
+                    
+                    # Animation for ruling
+                    pacer.transition("""
+                    <div style="text-align: center; padding: 15px;">
+                        <span style="font-size: 30px;">🔨</span>
+                        <h3 style="color: #e10600;">Overruled</h3>
+                    </div>
+                    """, 1)
+                    
+                    st.session_state.current_phase = 'evidence'
+                    st.rerun()
         
         if not objection_found:
             st.info("No objections have been raised to rule on.")
@@ -1093,43 +1230,33 @@ elif phase == 'closing':
         with col1:
             if st.button("Record Closing Argument"):
                 with st.spinner("Recording..."):
-                    st.session_state.tts_engine.speak("Please deliver your closing argument.")
-                    closing_argument = st.session_state.stt_engine.process_microphone_input()
+                    closing_argument = record_speech("Please deliver your closing argument.")
                     st.success(f"Recorded: {closing_argument}")
         with col2:
             if st.button("Submit Closing Argument", key="submit_closing"):
                 if closing_argument:
                     # Set current speaker for animation
                     st.session_state.current_speaker = role_for_animation
-                    sim.add_to_transcript(role, f"Closing Argument: {closing_argument}")
+                    add_to_transcript(role, f"Closing Argument: {closing_argument}")
                     
                     # Animate the closing argument
-                    st.markdown(f"""
+                    pacer.transition(f"""
                     <div style="padding: 10px; background-color: #000; border-radius: 5px; border: 1px solid #e10600;">
                         <strong style="color: #e10600;">{role} Closing:</strong> <span style="color: #fff;">{closing_argument[:50]}...</span>
                     </div>
-                    """, unsafe_allow_html=True)
-                    
-                    time.sleep(1)  # Short delay for animation effect
+                    """, 1)
                     
                     # Add fake opposition rebuttal if user is defendant lawyer and no closing from plaintiff yet
                     if role == "Defendant Lawyer":
-                        plaintiff_closing = False
-                        for entry in sim.get_state()['transcript']:
-                            if entry['speaker'] == "Plaintiff Lawyer" and "Closing Argument:" in entry['content']:
-                                plaintiff_closing = True
-                                break
+                        plaintiff_closing = transcript_store.count('closing', speaker="Plaintiff Lawyer") > 0
                         
                         if not plaintiff_closing:
-                            time.sleep(1)  # Delay for realism
+                            pacer.pause(1)  # Delay for realism
                             opposition_closing = "Thank you, Your Honor. In closing, I must emphasize that the evidence clearly shows ElectroTech's warranty policy is designed to evade responsibility. The testimony of our witnesses and technical experts confirms that the television suffered from a manufacturing defect, not user damage. We ask the court to hold ElectroTech accountable and award fair compensation to my client for both the defective product and the considerable distress caused by their unfair practices."
-                            sim.add_to_transcript("Plaintiff Lawyer", f"Closing Argument: {opposition_closing}")
+                            add_to_transcript("Plaintiff Lawyer", f"Closing Argument: {opposition_closing}")
                     
                     # Check if both lawyers have submitted closing arguments
-                    closing_count = 0
-                    for entry in sim.get_state()['transcript']:
-                        if 'Closing Argument:' in entry['content']:
-                            closing_count += 1
+                    closing_count = transcript_store.count('closing')
                     
                     if closing_count >= 2:
                         st.session_state.current_phase = 'judgment'
@@ -1175,25 +1302,23 @@ elif phase == 'judgment':
         with col1:
             if st.button("Record Judgment"):
                 with st.spinner("Recording..."):
-                    st.session_state.tts_engine.speak("Please deliver your judgment.")
-                    judgment_text = st.session_state.stt_engine.process_microphone_input()
+                    judgment_text = record_speech("Please deliver your judgment.")
                     st.success(f"Recorded: {judgment_text}")
         with col2:
             if st.button("Pronounce Judgment", key="pronounce_judgment"):
                 if judgment_text:
                     # Animation for judgment pronouncement
-                    st.markdown("""
+                    pacer.transition("""
                     <div style="text-align: center; animation: fadeIn 1s;">
                         <span style="font-size: 30px;">🔨</span>
                         <h2 style="color: #e10600;">ORDER! ORDER!</h2>
                     </div>
-                    """, unsafe_allow_html=True)
+                    """, 2)
                     
                     # Set current speaker for animation
                     st.session_state.current_speaker = "judge"
-                    sim.add_to_transcript("Judge", f"Final Judgment ({selected_judgment}): {judgment_text}")
+                    add_to_transcript("Judge", f"Final Judgment ({selected_judgment}): {judgment_text}")
                     
-                    time.sleep(2)  # Longer delay for dramatic effect
                     st.session_state.current_phase = 'completed'
                     st.rerun()
                 else:
@@ -1220,11 +1345,7 @@ elif phase == 'completed':
     """, unsafe_allow_html=True)
     
     # Display final judgment
-    final_judgment = None
-    for entry in reversed(sim.get_state()['transcript']):
-        if 'Final Judgment' in entry['content']:
-            final_judgment = entry
-            break
+    final_judgment = transcript_store.last('judgment')
     
     if final_judgment:
         st.markdown(f"""
@@ -1234,6 +1355,10 @@ elif phase == 'completed':
             <p><strong style="color: #fff;">{final_judgment['speaker']}:</strong> <span style="color: #fff;">{final_judgment['content']}</span></p>
         </div>
         """, unsafe_allow_html=True)
+        if st.button("🔊 Hear the Verdict"):
+            # One player starts with the first sentence and picks up the rest as they are synthesized;
+            # replays come from the audio cache
+            play_in_browser(st.session_state.tts_engine.stream(final_judgment['content']))
     
     # Show confetti animation
     st.session_state.courtroom_anim.animate_confetti()
@@ -1241,8 +1366,11 @@ elif phase == 'completed':
     # Option to start a new case
     if st.button("Start a New Case"):
         # Reset session state
+        if 'speculator' in st.session_state:
+            st.session_state.speculator.discard_all()
         for key in ['selected_case_id', 'selected_role', 'simulation', 'current_phase', 
-                    'transcript', 'evidence_presented', 'selected_witness', 'current_speaker']:
+                    'transcript', 'evidence_presented', 'selected_witness', 'current_speaker',
+                    'transcript_html', 'transcript_window', 'transcript_store', 'speculator']:
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
@@ -1263,12 +1391,11 @@ with cols[0]:
             "case_title": case["title"],
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "user_role": st.session_state.selected_role,
-            "transcript": sim.get_state()['transcript']
+            "transcript": transcript_store.entries
         }
         
-        # In a real app, this would save to a file or database
-        st.json(transcript_data)
-        st.success(f"Transcript saved as {filename}")
+        transcript_id = get_transcript_archive().save(st.session_state.username, transcript_data)
+        st.success(f"Transcript saved as {filename} (archive #{transcript_id})")
 
 with cols[1]:
     if st.button("Help / Tutorial"):
@@ -1288,8 +1415,11 @@ with cols[1]:
 with cols[2]:
     if st.button("Exit Simulation"):
         # Reset session state
+        if 'speculator' in st.session_state:
+            st.session_state.speculator.discard_all()
         for key in ['selected_case_id', 'selected_role', 'simulation', 'current_phase', 
-                    'transcript', 'evidence_presented', 'selected_witness', 'current_speaker']:
+                    'transcript', 'evidence_presented', 'selected_witness', 'current_speaker',
+                    'transcript_html', 'transcript_window', 'transcript_store', 'speculator']:
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
@@ -1373,19 +1503,7 @@ def get_defender_context_info(info_type):
 # --- Simulation Setup ---
 if 'simulation' not in st.session_state:
     # Prepare case_data for simulation manager
-    case_data = {
-        "case_id": case["case_id"],
-        "title": case["title"],
-        "type": case["case_type"],
-        "plaintiff": case["parties"]["plaintiff"],
-        "defendant": case["parties"]["defendant"],
-        "description": case["description"],
-        "judge_data": {"name": "Justice Rao", "experience": "20 years", "specialization": "Civil Law"},
-        "plaintiff_lawyer_data": {"name": "Adv. Mehta", "experience": "15 years", "specialization": "Contracts"},
-        "defendant_lawyer_data": {"name": "Adv. Singh", "experience": "12 years", "specialization": "Contracts"},
-        "witnesses": case["witnesses"],
-        "evidence": case["evidence"]
-    }
+    case_data = simulation_case_data(case)
     st.session_state.simulation = create_simulation(case_data)
     st.session_state.simulation_state = 'not_started'
     st.session_state.transcript = []
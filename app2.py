@@ -3,7 +3,6 @@
 import streamlit as st
 import json
 import os
-import time
 from datetime import datetime
 import random
 
@@ -13,11 +12,17 @@ from agents.defendant_agent import DefendantAgent
 from agents.judge_agent import JudgeAgent
 from agents.witness_agent import WitnessAgent
 from utils.simulation_manager import SimulationManager
-from utils.tts import TTSEngine
 from utils.stt import STTEngine
 from utils.courtroom_animation import CourtroomAnimation
 from utils.knowledge_base import load_laws
-from utils.helper import load_cases, save_transcript
+from case_catalog import get_case_catalog
+from response_cache import get_response_cache, cached_agent_call
+from pacing import Pacer
+from turn_scheduler import get_turn_executor
+from user_store import get_user_store
+from transcript_archive import get_transcript_archive
+from tts_cache import CachedTTSEngine
+from engine_pool import get_engine_pool
 
 # Load laws
 load_laws()
@@ -42,6 +47,10 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Transitions are paced according to PACING_MODE (server, client or production)
+pacer = Pacer()
+pacer.render_pending()
+
 # Global session state initialization
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -56,9 +65,11 @@ if "user_role" not in st.session_state:
 if "observer_mode" not in st.session_state:
     st.session_state.observer_mode = False
 if "tts_engine" not in st.session_state:
-    st.session_state.tts_engine = TTSEngine()
+    # Speech is synthesized into the shared audio cache and played from it; no TTSEngine is needed
+    st.session_state.tts_engine = CachedTTSEngine()
 if "stt_engine" not in st.session_state:
-    st.session_state.stt_engine = STTEngine()
+    # Recordings last as long as the speaker talks, so STT calls have no time limit
+    st.session_state.stt_engine = get_engine_pool("stt", STTEngine, call_timeout=0).proxy()
 if "courtroom_animation" not in st.session_state:
     st.session_state.courtroom_animation = CourtroomAnimation()
 if "phase" not in st.session_state:
@@ -69,7 +80,8 @@ st.sidebar.title("⚖️ Lex Orion")
 navigation = st.sidebar.radio("Navigation", ["Home", "Start Trial", "Case Management", "Transcripts", "Agent Evaluation", "Logout"])
 
 # Load case database
-cases = load_cases()
+case_catalog = get_case_catalog()
+cases = case_catalog.all()
 
 # --- Home Page ---
 if navigation == "Home":
@@ -93,16 +105,10 @@ if navigation == "Home":
         password = st.text_input("Password", type="password")
 
         if st.button("Submit"):
-            users_file = "data/users.json"
-            if not os.path.exists(users_file):
-                with open(users_file, "w") as f:
-                    json.dump({}, f)
-
-            with open(users_file, "r") as f:
-                users = json.load(f)
+            users = get_user_store()
 
             if option == "Login":
-                if username in users and users[username]["password"] == password:
+                if users.authenticate(username, password):
                     st.session_state.logged_in = True
                     st.session_state.username = username
                     st.success(f"Welcome back, {username}!")
@@ -110,12 +116,9 @@ if navigation == "Home":
                 else:
                     st.error("Invalid Credentials!")
             elif option == "Sign Up":
-                if username in users:
+                if not users.create_user(username, password):
                     st.error("Username already exists!")
                 else:
-                    users[username] = {"password": password, "transcripts": []}
-                    with open(users_file, "w") as f:
-                        json.dump(users, f)
                     st.success("Account Created! Please login now.")
                     st.experimental_rerun()
     else:
@@ -138,7 +141,7 @@ if navigation == "Start Trial":
 
     if st.button("Enter Courtroom"):
         case_id = selected_case.split(":")[0]
-        case_data = next((c for c in cases if str(c["case_id"]) == case_id), None)
+        case_data = case_catalog.get(case_id)
         if not case_data:
             st.error("Case not found!")
             st.stop()
@@ -178,12 +181,13 @@ if navigation == "Case Management":
     uploaded_file = st.file_uploader("Upload New Case File (JSON Format)", type=["json"])
 
     if uploaded_file:
-        new_case = json.load(uploaded_file)
-        cases.append(new_case)
-        with open("data/cases.json", "w") as f:
-            json.dump({"cases": cases}, f, indent=2)
-        st.success("New case uploaded successfully!")
-        st.experimental_rerun()
+        try:
+            case_catalog.add_case(json.load(uploaded_file))
+        except ValueError as e:
+            st.error(f"Case not added: {e}")
+        else:
+            st.success("New case uploaded successfully!")
+            st.experimental_rerun()
 
     st.write("---")
     st.write("### Existing Cases")
@@ -193,20 +197,40 @@ if navigation == "Case Management":
 # --- Transcripts Page ---
 if navigation == "Transcripts":
     st.title("📜 Past Transcripts")
-    transcripts_dir = f"data/transcripts/{st.session_state.username}"
-    os.makedirs(transcripts_dir, exist_ok=True)
-
-    files = os.listdir(transcripts_dir)
-    if files:
-        selected_file = st.selectbox("Select Transcript", files)
-        if selected_file:
-            with open(os.path.join(transcripts_dir, selected_file)) as f:
-                data = json.load(f)
-            st.json(data)
+    archive = get_transcript_archive()
+    username = st.session_state.username
+    page_size = 20
+
+    query = st.text_input("Search transcripts")
+    if query:
+        hits = archive.search(query, username=username)
+        for hit in hits:
+            st.markdown(f"**#{hit['id']} {hit['case_title'] or hit['case_id']}** ({hit['date']}) — {hit['speaker']}: {hit['snippet']}")
+        if not hits:
+            st.info("No matching transcripts.")
+
+    total = archive.count(username=username)
+    if total:
+        page = st.number_input("Page", min_value=1, max_value=(total - 1) // page_size + 1, value=1)
+        summaries = archive.summaries(username=username, limit=page_size, offset=(page - 1) * page_size)
+        labels = {
+            f"#{s['id']} {s['case_title'] or s['case_id']} — {s['date']} ({s['entry_count']} entries)": s
+            for s in summaries
+        }
+        selected = labels[st.selectbox("Select Transcript", list(labels))]
+        st.caption(selected["summary"])
+
+        entry_page_size = 100
+        entry_pages = max((selected["entry_count"] - 1) // entry_page_size + 1, 1)
+        entry_page = st.number_input("Entries page", min_value=1, max_value=entry_pages, value=1)
+        for entry in archive.entries(selected["id"], (entry_page - 1) * entry_page_size, entry_page_size):
+            st.markdown(f"**{entry['speaker']}:** {entry['content']}")
+
+        if st.button("Prepare Download"):
             st.download_button(
                 label="Download Transcript",
-                data=json.dumps(data, indent=2),
-                file_name=selected_file,
+                data=json.dumps(archive.export(selected["id"]), indent=2),
+                file_name=f"transcript_{selected['case_id']}_{selected['id']}.json",
                 mime="application/json"
             )
     else:
@@ -229,30 +253,40 @@ if navigation == "Agent Evaluation":
     # Add all witnesses
     for wid, witness in sim.witnesses.items():
         agents[f"Witness ({witness.config.get('name', wid)})"] = witness
-    for name, agent in agents.items():
+    response_cache = get_response_cache()
+    case_id = sim.case_data.get("case_id")
+    timeout = float(os.getenv("LLM_TIMEOUT", "60"))
+    # Start every agent's LLM calls at once so the page waits about one round trip, not one per call
+    executor = get_turn_executor()
+    pending = {
+        name: (
+            executor.submit(cached_agent_call, response_cache, agent, "analyze_case", sim.case_data, case_id=case_id),
+            executor.submit(cached_agent_call, response_cache, agent, "prepare_arguments", sim.case_data, case_id=case_id)
+        )
+        for name, agent in agents.items()
+    }
+    for name, (analysis, arguments) in pending.items():
         st.subheader(f"{name}")
         with st.expander("Case Analysis", expanded=False):
             try:
-                analysis = agent.analyze_case(sim.case_data)
-                st.json(analysis)
+                st.json(analysis.result(timeout=timeout))
             except Exception as e:
                 st.error(f"Analysis not available: {e}")
         with st.expander("Prepared Arguments", expanded=False):
             try:
-                arguments = agent.prepare_arguments(sim.case_data)
-                st.write(arguments)
+                st.write(arguments.result(timeout=timeout))
             except Exception as e:
                 st.error(f"Arguments not available: {e}")
+        # Metrics reflect the calls above, so read them only once both have finished
         with st.expander("Performance Metrics", expanded=False):
             try:
-                metrics = agent.get_performance_metrics()
-                st.json(metrics)
+                st.json(agents[name].get_performance_metrics())
             except Exception as e:
                 st.error(f"Metrics not available: {e}")
+    st.caption(f"Response cache: {response_cache.stats()}")
 
 # --- Logout Option ---
 if navigation == "Logout":
     st.session_state.clear()
-    st.success("Logged out successfully!")
-    time.sleep(1)
+    pacer.transition("<p>Logged out successfully!</p>", 1)
     st.experimental_rerun()
@@ -0,0 +1,157 @@
+# batch_metrics.py
+# Vectorized BLEU and token F1 scoring for Indian Court Simulator evaluations
+
+import numpy as np
+
+
+class EncodedBatch:
+    """
+    Hypotheses followed by references, whitespace-tokenized once into integer ids.
+    """
+    def __init__(self, hypotheses, references):
+        self.num_samples = len(hypotheses)
+        token_lists = [text.split() for text in hypotheses] + [text.split() for text in references]
+        self.lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+        self.vocab = {}
+        self.ids = np.fromiter(
+            (self.vocab.setdefault(token, len(self.vocab)) for tokens in token_lists for token in tokens),
+            dtype=np.int64,
+            count=int(self.lengths.sum())
+        )
+        segments = np.repeat(np.arange(len(token_lists)), self.lengths)
+        starts = np.cumsum(self.lengths) - self.lengths
+        self.positions = np.arange(len(self.ids)) - np.repeat(starts, self.lengths)
+        self.segment_lengths = self.lengths[segments]
+        self.is_hyp = segments < self.num_samples
+        self.samples = np.where(self.is_hyp, segments, segments - self.num_samples)
+        self.hyp_lengths = self.lengths[:self.num_samples]
+        self.ref_lengths = self.lengths[self.num_samples:]
+
+    def lowercase_ids(self):
+        """
+        Token ids after lowercasing, computed per vocabulary entry rather than per token.
+        """
+        lower_vocab = {}
+        lookup = np.fromiter(
+            (lower_vocab.setdefault(token.lower(), len(lower_vocab)) for token in self.vocab),
+            dtype=np.int64,
+            count=len(self.vocab)
+        )
+        return lookup[self.ids]
+
+
+def _count_overlap(hyp_keys, ref_keys, num_samples, stride):
+    """
+    Sum min(hyp count, ref count) per sample for keys of the form sample * stride + gram.
+    """
+    hyp_unique, hyp_counts = np.unique(hyp_keys, return_counts=True)
+    ref_unique, ref_counts = np.unique(ref_keys, return_counts=True)
+    common, hyp_idx, ref_idx = np.intersect1d(hyp_unique, ref_unique, assume_unique=True, return_indices=True)
+    clipped = np.minimum(hyp_counts[hyp_idx], ref_counts[ref_idx])
+    return np.bincount(common // stride, weights=clipped, minlength=num_samples)
+
+
+def _bleu_statistics(batch, max_n):
+    """
+    Return per-sample clipped n-gram matches and hypothesis n-gram totals, each shaped (max_n, samples).
+    """
+    ids = batch.ids
+    stride = len(ids) + 1
+    matches = np.zeros((max_n, batch.num_samples))
+    totals = np.zeros((max_n, batch.num_samples))
+    grams = ids
+    for n in range(1, max_n + 1):
+        if n > 1:
+            # Extend (n-1)-gram ids by the next token and re-number them densely,
+            # which keeps ids below the token count however large n gets
+            pairs = grams[:len(ids) - n + 1] * stride + ids[n - 1:]
+            grams = np.full(len(ids), -1, dtype=np.int64)
+            grams[:len(pairs)] = np.unique(pairs, return_inverse=True)[1].ravel()
+        valid = batch.positions + n <= batch.segment_lengths
+        keys = batch.samples * stride + grams
+        matches[n - 1] = _count_overlap(
+            keys[valid & batch.is_hyp], keys[valid & ~batch.is_hyp], batch.num_samples, stride
+        )
+        # As in nltk, every sentence contributes at least one n-gram to the denominator
+        totals[n - 1] = np.maximum(batch.hyp_lengths - n + 1, 1)
+    return matches, totals
+
+
+def _bleu(matches, totals, hyp_lengths, ref_lengths):
+    """
+    Geometric mean of modified n-gram precisions with a brevity penalty.
+    Like unsmoothed sentence_bleu, any n-gram order without a match scores 0.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_precisions = np.log(matches / totals)
+        brevity = np.where(
+            hyp_lengths > ref_lengths, 1.0,
+            np.exp(1 - ref_lengths / np.where(hyp_lengths > 0, hyp_lengths, 1))
+        )
+        scores = brevity * np.exp(log_precisions.mean(axis=0))
+    return np.where((matches > 0).all(axis=0) & (hyp_lengths > 0), scores, 0.0)
+
+
+def _f1(common, hyp_lengths, ref_lengths):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = common / hyp_lengths
+        recall = common / ref_lengths
+        score = 2 * precision * recall / (precision + recall)
+    return np.where((hyp_lengths > 0) & (ref_lengths > 0) & (common > 0), score, 0.0)
+
+
+def _batch_bleu(batch, max_n):
+    matches, totals = _bleu_statistics(batch, max_n)
+    per_sample = _bleu(matches, totals, batch.hyp_lengths, batch.ref_lengths)
+    corpus = _bleu(
+        matches.sum(axis=1, keepdims=True), totals.sum(axis=1, keepdims=True),
+        batch.hyp_lengths.sum(keepdims=True), batch.ref_lengths.sum(keepdims=True)
+    )
+    return per_sample, float(corpus[0])
+
+
+def _batch_f1(batch):
+    ids = batch.lowercase_ids()
+    stride = len(ids) + 1
+    keys = batch.samples * stride + ids
+    # Each distinct token counts once per pair, so deduplicate before overlapping
+    common = _count_overlap(
+        np.unique(keys[batch.is_hyp]), np.unique(keys[~batch.is_hyp]), batch.num_samples, stride
+    )
+    per_sample = _f1(common, batch.hyp_lengths, batch.ref_lengths)
+    corpus = _f1(common.sum(), batch.hyp_lengths.sum(), batch.ref_lengths.sum())
+    return per_sample, float(corpus)
+
+
+def batch_bleu(hypotheses, references, max_n=4):
+    """
+    Score whitespace-tokenized hypotheses against one reference each, matching
+    nltk's unsmoothed sentence_bleu and corpus_bleu.
+    Returns (per-sample BLEU array, corpus BLEU).
+    """
+    return _batch_bleu(EncodedBatch(list(hypotheses), list(references)), max_n)
+
+
+def batch_f1(hypotheses, references):
+    """
+    Lowercased token F1 of each pair: distinct shared tokens over the hypothesis
+    and reference token counts.
+    Returns (per-sample F1 array, micro-averaged corpus F1).
+    """
+    return _batch_f1(EncodedBatch(list(hypotheses), list(references)))
+
+
+def batch_scores(hypotheses, references, max_n=4):
+    """
+    Compute per-sample and corpus-level BLEU and token F1 for a batch of responses,
+    tokenizing the batch only once.
+    """
+    batch = EncodedBatch(list(hypotheses), list(references))
+    bleu, corpus_bleu = _batch_bleu(batch, max_n)
+    f1, corpus_f1 = _batch_f1(batch)
+    return {
+        "bleu": bleu,
+        "f1": f1,
+        "corpus_bleu": corpus_bleu,
+        "corpus_f1": corpus_f1
+    }
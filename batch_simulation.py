@@ -0,0 +1,246 @@
+# batch_simulation.py
+# Headless AI-only trial runner for Indian Court Simulator
+
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from case_catalog import get_case_catalog, simulation_case_data
+from turn_scheduler import TurnScheduler
+from llm_gateway import attach_gateway
+
+TRIAL_PHASES = ("opening", "examination", "evidence", "objection", "closing", "judgment")
+
+
+def create_headless_simulation(case_data):
+    from courtroom.simulation_manager import create_simulation
+
+    return create_simulation(case_data)
+
+
+def _text(response) -> str:
+    if isinstance(response, str):
+        return response
+    return json.dumps(response, default=str)
+
+
+class HeadlessTrial:
+    """
+    Runs one full AI-only trial, from opening statements to judgment, without Streamlit.
+    Independent turns within a phase run concurrently, every turn is added to the
+    simulation transcript in script order, and each phase is timed.
+
+    Each agent's context is built when its turn starts, but turns of the same
+    phase are added to the transcript only as the phase is reported, so an agent
+    does not see the phase's other turns in it the way a sequential run would.
+    Where a turn needs an earlier one (a question needs the previous answer, a
+    ruling the objection) that result is passed to it directly.
+
+    Agents are not known to be thread-safe, so calls to the same agent object
+    are serialized; only turns of different agents actually overlap.
+    """
+    def __init__(self, case_data, simulation_factory=create_headless_simulation, questions_per_witness=2,
+                 max_concurrency=8):
+        self.case_data = case_data
+        self.sim = simulation_factory(case_data)
+        agents = [self.sim.judge, self.sim.plaintiff_lawyer, self.sim.defendant_lawyer, *self.sim.witnesses.values()]
+        for agent in agents:
+            attach_gateway(agent)
+        self._agent_locks = {id(agent): threading.Lock() for agent in agents}
+        self.questions_per_witness = questions_per_witness
+        self.scheduler = TurnScheduler(max_concurrency)
+        self.turns = 0
+
+    def say(self, speaker, content):
+        self.sim.add_to_transcript(speaker, _text(content))
+        self.turns += 1
+
+    def ask(self, agent, method, *args):
+        """
+        Call agent.method(*args), waiting for any other call to the same agent to finish.
+        """
+        with self._agent_locks[id(agent)]:
+            return getattr(agent, method)(*args)
+
+    def context(self, phase, **extra):
+        return {
+            "phase": phase,
+            "case": self.case_data,
+            "transcript": self.sim.get_state()["transcript"][-10:],
+            **extra
+        }
+
+    def opening(self):
+        turns = self.scheduler
+        turns.say("Judge", f"Court is now in session for case {self.case_data['case_id']}: "
+                           f"{self.case_data['title']}. Plaintiff lawyer, please proceed with your opening statement.")
+        turns.add("Plaintiff Lawyer", self.ask, self.sim.plaintiff_lawyer, "prepare_arguments", self.case_data)
+        turns.say("Judge", "Defendant lawyer, please present your opening statement.")
+        turns.add("Defendant Lawyer", self.ask, self.sim.defendant_lawyer, "prepare_arguments", self.case_data)
+
+    def examination(self):
+        # Witnesses are examined concurrently; each question waits for the previous answer.
+        # The one lawyer asks every witness, so only answers and questions to other witnesses overlap.
+        turns = self.scheduler
+        lawyer = self.sim.plaintiff_lawyer
+        for wid, witness in self.sim.witnesses.items():
+            name = witness.config.get("name", wid)
+            turns.say("Judge", f"{name}, please take the stand. Remember you are under oath.")
+            answer = None
+            for _ in range(self.questions_per_witness):
+                question = turns.add(
+                    "Plaintiff Lawyer",
+                    lambda previous=None, name=name: _text(self.ask(lawyer, "generate_response", self.context(
+                        "examination", witness=name, previous_answer=None if previous is None else _text(previous)
+                    ))),
+                    after=[answer] if answer else [],
+                    prefix=f"Question to {name}: "
+                )
+                answer = turns.add(
+                    f"Witness ({name})",
+                    lambda question, witness=witness, name=name: self.ask(witness, "respond_to_question", name, question),
+                    after=[question]
+                )
+
+    def evidence(self):
+        turns = self.scheduler
+        for item in self.case_data.get("evidence", []):
+            turns.say("Plaintiff Lawyer", f"I present the following evidence: {_text(item)}")
+            turns.add(
+                "Defendant Lawyer",
+                lambda item=item: self.ask(
+                    self.sim.defendant_lawyer, "generate_response", self.context("evidence", evidence=item)
+                )
+            )
+
+    def objection(self):
+        turns = self.scheduler
+        objection = turns.add(
+            "Defendant Lawyer",
+            lambda: _text(self.ask(self.sim.defendant_lawyer, "raise_objection", self.context("objection"))),
+            prefix="Objection: "
+        )
+        turns.add(
+            "Judge",
+            lambda objection: self.ask(
+                self.sim.judge, "rule_on_objection", self.context("objection", objection=objection)
+            ),
+            after=[objection]
+        )
+
+    def closing(self):
+        turns = self.scheduler
+        turns.add("Plaintiff Lawyer", lambda: self.ask(self.sim.plaintiff_lawyer, "generate_response", self.context("closing")))
+        turns.add("Defendant Lawyer", lambda: self.ask(self.sim.defendant_lawyer, "generate_response", self.context("closing")))
+
+    def judgment(self):
+        self.scheduler.add(
+            "Judge",
+            lambda: f"Final Judgment: {_text(self.ask(self.sim.judge, 'generate_response', self.context('judgment')))}"
+        )
+
+    def run(self) -> dict:
+        phase_times = {}
+        start = time.time()
+        for phase in TRIAL_PHASES:
+            phase_start = time.time()
+            getattr(self, phase)()
+            self.scheduler.run(on_turn=self.say)
+            phase_times[phase] = round(time.time() - phase_start, 4)
+        return {
+            "case_id": self.case_data["case_id"],
+            "case_title": self.case_data.get("title"),
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "user_role": "Observer",
+            "turns": self.turns,
+            "phase_times_sec": phase_times,
+            "time_taken_sec": round(time.time() - start, 4),
+            "transcript": self.sim.get_state()["transcript"]
+        }
+
+
+def run_trial(case_id, trial_index=0, output_dir=None):
+    """
+    Run one trial of a catalog case and optionally write its transcript to output_dir.
+    Top-level so it can run in worker processes; returns the trial record without
+    the transcript body when one was written.
+    """
+    case_data = get_case_catalog().get(case_id)
+    record = {"case_id": str(case_id), "trial": trial_index, "success": False}
+    try:
+        if case_data is None:
+            raise KeyError(f"Case {case_id} not found")
+        record.update(HeadlessTrial(simulation_case_data(case_data)).run())
+        record["success"] = True
+    except Exception as e:
+        record["error"] = repr(e)
+        record["traceback"] = traceback.format_exc()
+    if output_dir and record["success"]:
+        path = os.path.join(output_dir, f"trial_{case_id}_{trial_index:05d}.json")
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2, default=str)
+        record = {k: v for k, v in record.items() if k != "transcript"}
+        record["path"] = path
+    return record
+
+
+def summarize_trials(records, wall_time):
+    times = np.array([r["time_taken_sec"] for r in records if r["success"]])
+    p50, p95 = np.percentile(times, [50, 95]).round(4).tolist() if times.size else (None, None)
+    phases = {}
+    for record in records:
+        for phase, seconds in record.get("phase_times_sec", {}).items():
+            phases.setdefault(phase, []).append(seconds)
+    return {
+        "trials": len(records),
+        "succeeded": int(sum(r["success"] for r in records)),
+        "wall_time_sec": round(wall_time, 4),
+        "trials_per_sec": round(len(records) / wall_time, 4) if wall_time else None,
+        "trial_p50_sec": p50,
+        "trial_p95_sec": p95,
+        "turns": int(sum(r.get("turns", 0) for r in records)),
+        "phase_mean_sec": {phase: round(float(np.mean(values)), 4) for phase, values in phases.items()}
+    }
+
+
+class BatchSimulationRunner:
+    """
+    Runs many headless trials concurrently on a thread pool (agents mostly wait on
+    the LLM) or, with processes=True, on a process pool.
+    """
+    def __init__(self, max_workers=8, processes=False, output_dir="data/batch_trials"):
+        self.max_workers = max_workers
+        self.processes = processes
+        self.output_dir = output_dir
+
+    def run(self, case_ids, trials_per_case=1, on_result=None):
+        """
+        Run every case trials_per_case times. Returns (records in submission order, summary);
+        on_result is called with each record as it finishes.
+        """
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        jobs = [(case_id, i) for case_id in case_ids for i in range(trials_per_case)]
+        records = [None] * len(jobs)
+        pool_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        start = time.time()
+        with pool_class(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(run_trial, case_id, i, self.output_dir): index
+                for index, (case_id, i) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                records[futures[future]] = future.result()
+                if on_result:
+                    on_result(records[futures[future]])
+        summary = summarize_trials(records, time.time() - start)
+        if self.output_dir:
+            with open(os.path.join(self.output_dir, "summary.json"), "w") as f:
+                json.dump({"summary": summary, "trials": records}, f, indent=2, default=str)
+        return records, summary
@@ -0,0 +1,134 @@
+# case_catalog.py
+# Process-wide case catalog for Indian Court Simulator
+
+import json
+import os
+import threading
+
+DEFAULT_CASES_FILE = "data/cases.json"
+
+
+class CaseCatalog:
+    """
+    Parsed view of the cases file shared by every session in the process.
+    The file is only re-read when its mtime or size changes.
+    """
+    def __init__(self, path: str = DEFAULT_CASES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._cases = []
+        self._by_id = {}
+        self._by_type = {}
+        self._by_party = {}
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _index(self, cases: list):
+        by_id, by_type, by_party = {}, {}, {}
+        for case in cases:
+            by_id[str(case["case_id"])] = case
+            by_type.setdefault(case.get("case_type"), []).append(case)
+            for party in case.get("parties", {}).values():
+                if isinstance(party, str):
+                    by_party.setdefault(party.lower(), []).append(case)
+        # Swap in the new indexes in one go so readers never see a half-built catalog
+        self._cases, self._by_id, self._by_type, self._by_party = cases, by_id, by_type, by_party
+
+    def refresh(self):
+        """
+        Reload the cases file if it changed since the last load.
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return
+            with open(self.path, "r") as f:
+                cases = json.load(f)["cases"]
+            self._index(cases)
+            self._signature = signature
+
+    def all(self) -> list:
+        self.refresh()
+        return list(self._cases)
+
+    def get(self, case_id):
+        self.refresh()
+        return self._by_id.get(str(case_id))
+
+    def by_type(self, case_type: str) -> list:
+        self.refresh()
+        return list(self._by_type.get(case_type, []))
+
+    def by_party(self, name: str) -> list:
+        self.refresh()
+        return list(self._by_party.get(name.lower(), []))
+
+    def validate(self, case) -> None:
+        """
+        Raise ValueError if a case cannot be indexed or listed, so it never reaches the file.
+        """
+        if not isinstance(case, dict):
+            raise ValueError("A case must be a JSON object")
+        if case.get("case_id") in (None, ""):
+            raise ValueError("Case is missing case_id")
+        if not case.get("title"):
+            raise ValueError(f"Case {case['case_id']} is missing title")
+        if not isinstance(case.get("parties", {}), dict):
+            raise ValueError(f"Case {case['case_id']}: parties must be an object")
+        if str(case["case_id"]) in self._by_id:
+            raise ValueError(f"Case {case['case_id']} already exists")
+
+    def add_case(self, case: dict):
+        """
+        Append a case and persist the catalog atomically. Raises ValueError,
+        leaving the file untouched, if the case is invalid.
+        """
+        self.refresh()
+        with self._lock:
+            self.validate(case)
+            cases = self._cases + [case]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"cases": cases}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._index(cases)
+            self._signature = self._file_signature()
+
+
+def simulation_case_data(case: dict) -> dict:
+    """
+    Adapt a catalog case to the case data create_simulation expects.
+    """
+    return {
+        "case_id": case["case_id"],
+        "title": case["title"],
+        "type": case["case_type"],
+        "plaintiff": case["parties"]["plaintiff"],
+        "defendant": case["parties"]["defendant"],
+        "description": case["description"],
+        "judge_data": {"name": "Justice Rao", "experience": "20 years", "specialization": "Civil Law"},
+        "plaintiff_lawyer_data": {"name": "Adv. Mehta", "experience": "15 years", "specialization": "Contracts"},
+        "defendant_lawyer_data": {"name": "Adv. Singh", "experience": "12 years", "specialization": "Contracts"},
+        "witnesses": case["witnesses"],
+        "evidence": case["evidence"]
+    }
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_case_catalog(path: str = DEFAULT_CASES_FILE) -> CaseCatalog:
+    """
+    Return the shared catalog for a cases file, creating it on first use.
+    """
+    with _catalogs_lock:
+        if path not in _catalogs:
+            _catalogs[path] = CaseCatalog(path)
+        return _catalogs[path]
@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import logging
+import argparse
 from datetime import datetime
 from rich.console import Console
 from rich.panel import Panel
@@ -111,7 +112,45 @@ class CourtroomCLI:
         self.print_status("Simulation ended")
         self.console.print("\nThank you for using Indian Court Simulator!")
 
+    def run_batch(self, case_ids, trials_per_case=1, workers=8, processes=False, output_dir="data/batch_trials"):
+        """Run headless AI-only trials and print their timing summary"""
+        from batch_simulation import BatchSimulationRunner
+
+        self.print_header()
+        runner = BatchSimulationRunner(max_workers=workers, processes=processes, output_dir=output_dir)
+        with Progress(SpinnerColumn(), TextColumn("{task.description} {task.completed}/{task.total}"),
+                      console=self.console) as progress:
+            task = progress.add_task("Running trials", total=len(case_ids) * trials_per_case)
+
+            def on_result(record):
+                if not record["success"]:
+                    logger.error(f"Trial {record['trial']} of case {record['case_id']} failed: {record['error']}")
+                progress.advance(task)
+
+            records, summary = runner.run(case_ids, trials_per_case, on_result=on_result)
+        self.print_event("Batch Summary", summary)
+        return records, summary
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Indian Court Simulator CLI")
+    subparsers = parser.add_subparsers(dest="command")
+    batch = subparsers.add_parser("batch", help="Run headless AI-only trials")
+    batch.add_argument("case_ids", nargs="*", help="Case IDs to simulate (default: every case in the catalog)")
+    batch.add_argument("--trials", type=int, default=1, help="Trials to run per case")
+    batch.add_argument("--workers", type=int, default=8, help="Concurrent trials")
+    batch.add_argument("--processes", action="store_true", help="Use worker processes instead of threads")
+    batch.add_argument("--output", default="data/batch_trials", help="Directory for transcripts and summary.json")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    if args.command == "batch":
+        from case_catalog import get_case_catalog
+
+        case_ids = args.case_ids or [case["case_id"] for case in get_case_catalog().all()]
+        CourtroomCLI().run_batch(case_ids, args.trials, args.workers, args.processes, args.output)
+        return
+
     cli = CourtroomCLI()
     
     # Example usage
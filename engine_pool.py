@@ -0,0 +1,170 @@
+# engine_pool.py
+# Process-wide speech engine pools for Indian Court Simulator
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+
+
+class EnginePool:
+    """
+    A few engine instances shared by every session in the process.
+
+    Each worker thread creates its own engine once and then serves jobs from a
+    bounded queue, so engines are never used by two jobs at the same time.
+    """
+    def __init__(self, factory, size: int = 2, max_queue: int = 64, submit_timeout: float = 30.0,
+                 call_timeout: float = 60.0, latency_window: int = 200):
+        self.factory = factory
+        self.size = size
+        self.submit_timeout = submit_timeout
+        # 0 or None: callers wait as long as the engine takes
+        self.call_timeout = call_timeout or None
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self._jobs = queue.Queue(maxsize=max_queue)
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self._engines = 0
+        self._methods = {}
+        self._workers = [
+            threading.Thread(target=self._work, name=f"engine-pool-{i}", daemon=True)
+            for i in range(size)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self):
+        engine, error = None, None
+        try:
+            engine = self.factory()
+            with self._lock:
+                self._engines += 1
+        except Exception as e:
+            # Keep serving the queue so callers see the error instead of hanging
+            error = e
+        while True:
+            future, fn, args, kwargs, queued_at = self._jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if error is not None:
+                    raise error
+                future.set_result(fn(engine, *args, **kwargs))
+                failed = False
+            except BaseException as e:
+                future.set_exception(e)
+                failed = True
+            with self._lock:
+                self._latencies.append(time.time() - queued_at)
+                if failed:
+                    self.jobs_failed += 1
+                else:
+                    self.jobs_done += 1
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Queue fn(engine, *args, **kwargs) for the next free engine.
+        Raises RuntimeError if the queue stays full for submit_timeout seconds.
+        """
+        future = Future()
+        try:
+            self._jobs.put((future, fn, args, kwargs, time.time()), timeout=self.submit_timeout)
+        except queue.Full:
+            raise RuntimeError(f"Engine pool is busy ({self._jobs.qsize()} jobs queued)")
+        return future
+
+    def _wait(self, future: Future, timeout: float = None):
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # Drop the job if no engine has picked it up yet
+            future.cancel()
+            raise
+
+    def call(self, method: str, *args, **kwargs):
+        """
+        Run engine.method(*args, **kwargs) on a pooled engine and wait for the result,
+        up to call_timeout seconds.
+        """
+        return self._wait(self.submit(lambda engine: getattr(engine, method)(*args, **kwargs)), self.call_timeout)
+
+    def has_method(self, name: str) -> bool:
+        """
+        Whether the pooled engines have a method called `name`. Checked once per
+        name; if the pool cannot answer (busy, timed out, engine failed to start)
+        the answer is False and the name is checked again next time.
+        """
+        with self._lock:
+            known = self._methods.get(name)
+        if known is None:
+            try:
+                known = self._wait(
+                    self.submit(lambda engine: callable(getattr(engine, name, None))),
+                    self.call_timeout or self.submit_timeout
+                )
+            except Exception:
+                return False
+            with self._lock:
+                self._methods[name] = known
+        return known
+
+    def proxy(self):
+        return EngineProxy(self)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "engines": self._engines,
+                "workers": self.size,
+                "queue_depth": self._jobs.qsize(),
+                "jobs_done": self.jobs_done,
+                "jobs_failed": self.jobs_failed,
+                "avg_latency_sec": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                "p95_latency_sec": round(latencies[int(0.95 * (len(latencies) - 1))], 4) if latencies else 0.0
+            }
+
+
+class EngineProxy:
+    """
+    Stands in for an engine in session state; each method call runs on the pool.
+    Only the engine's methods are forwarded, so hasattr() answers as it would for
+    the engine itself.
+    """
+    def __init__(self, pool: EnginePool):
+        self.pool = pool
+
+    def __getattr__(self, name):
+        pool = self.__dict__.get("pool")
+        if pool is None or name.startswith("__") or not pool.has_method(name):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return pool.call(name, *args, **kwargs)
+        return call
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_engine_pool(name: str, factory, size: int = None, call_timeout: float = None) -> EnginePool:
+    """
+    Return the process-wide pool for `name`, creating it on first use.
+    Sizes default to ENGINE_POOL_SIZE workers and ENGINE_QUEUE_SIZE queued jobs,
+    and calls wait up to ENGINE_CALL_TIMEOUT seconds unless `call_timeout` is
+    given (0 for no limit).
+    """
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = EnginePool(
+                factory,
+                size=size or int(os.getenv("ENGINE_POOL_SIZE", "2")),
+                max_queue=int(os.getenv("ENGINE_QUEUE_SIZE", "64")),
+                call_timeout=float(os.getenv("ENGINE_CALL_TIMEOUT", "60")) if call_timeout is None else call_timeout
+            )
+        return _pools[name]
@@ -0,0 +1,323 @@
+# llm_gateway.py
+# Shared LLM gateway for Indian Court Simulator agents
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts of up to `capacity`.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting for it up to `timeout` seconds (forever if None).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Rate limits, timeouts, connection failures and 5xx responses are worth
+    retrying on another provider; bad requests are not.
+    """
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    name = type(error).__name__
+    return any(kind in name for kind in ("RateLimit", "Timeout", "Connection"))
+
+
+def is_model_error(error: Exception) -> bool:
+    """
+    The provider does not serve the requested model; another provider might.
+    """
+    status = getattr(error, "status_code", None)
+    message = str(error).lower()
+    return status == 404 or (
+        status == 400 and "model" in message and any(
+            phrase in message for phrase in ("not found", "does not exist", "decommissioned", "not supported")
+        )
+    )
+
+
+class Provider:
+    """
+    One chat completion backend with its own rate limit, default model and the
+    other models it serves. After a retryable failure it is skipped for
+    `cooldown` seconds.
+    """
+    def __init__(self, name: str, client, default_model: str, rate: float = 5.0, burst: float = 10.0,
+                 cooldown: float = 10.0, models=()):
+        self.name = name
+        self.client = client
+        self.default_model = default_model
+        self.models = set(models)
+        self.bucket = TokenBucket(rate, burst)
+        self.cooldown = cooldown
+        self.available_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def serves(self, model) -> bool:
+        return bool(model) and (model == self.default_model or model in self.models)
+
+    def create(self, **kwargs):
+        self.bucket.acquire()
+        with self._lock:
+            self.requests += 1
+        return self.client.chat.completions.create(**kwargs)
+
+    def fail(self):
+        with self._lock:
+            self.failures += 1
+            self.available_at = time.monotonic() + self.cooldown
+
+
+def _http_client():
+    """
+    A keep-alive connection pool so requests reuse TLS connections.
+    """
+    import httpx
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "50")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=60
+        ),
+        timeout=float(os.getenv("LLM_TIMEOUT", "60"))
+    )
+
+
+def _models(variable: str):
+    return [m.strip() for m in os.getenv(variable, "").split(",") if m.strip()]
+
+
+def groq_provider() -> Provider:
+    from groq import Groq
+
+    client = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=_http_client(), max_retries=0)
+    return Provider(
+        "groq", client, os.getenv("GROQ_MODEL") or os.getenv("DEFAULT_MODEL"),
+        rate=float(os.getenv("GROQ_RPS", "5")), burst=float(os.getenv("GROQ_BURST", "10")),
+        models=_models("GROQ_MODELS")
+    )
+
+
+def openai_provider() -> Provider:
+    from openai import OpenAI
+
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_http_client(), max_retries=0)
+    return Provider(
+        "openai", client, os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+        rate=float(os.getenv("OPENAI_RPS", "5")), burst=float(os.getenv("OPENAI_BURST", "10")),
+        models=_models("OPENAI_MODELS")
+    )
+
+
+class FakeCompletions:
+    """
+    Offline stand-in for client.chat.completions: replies deterministically by
+    echoing the last message, with or without streaming.
+    """
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, model=None, messages=(), stream=False, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = messages[-1]["content"] if messages else ""
+        content = f"[{model}] {prompt}"
+        if stream:
+            return iter([
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))])
+                for word in content.split()
+            ])
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=content), finish_reason="stop")]
+        )
+
+
+def fake_provider(latency: float = 0.0) -> Provider:
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(latency)))
+    return Provider("fake", client, os.getenv("DEFAULT_MODEL", "fake-model"), rate=1000.0, burst=1000.0)
+
+
+PROVIDERS = {
+    "groq": groq_provider,
+    "openai": openai_provider,
+    "fake": fake_provider
+}
+
+
+class LLMGateway:
+    """
+    The one path from agents to the LLM providers. Requests go to the first
+    available provider in order, failing over to the next on rate limits and
+    outages; identical requests already in flight share a single call.
+
+    A requested model goes to the provider that serves it (see Provider.models);
+    every other provider answers with its own default model.
+    """
+    def __init__(self, providers, timeout: float = 60.0):
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _candidates(self):
+        now = time.monotonic()
+        ready = [p for p in self.providers if p.available_at <= now]
+        # If everything is cooling down, try anyway rather than fail outright
+        return ready or sorted(self.providers, key=lambda p: p.available_at)
+
+    def _owner(self, model):
+        """
+        The provider a requested model belongs to; unknown models go to the primary.
+        """
+        if not model:
+            return None
+        return next((p for p in self.providers if p.serves(model)), self.providers[0])
+
+    def _create(self, kwargs):
+        error = None
+        owner = self._owner(kwargs.get("model"))
+        for provider in self._candidates():
+            request = dict(kwargs)
+            if provider is not owner:
+                request["model"] = provider.default_model
+            try:
+                return provider.create(**request)
+            except Exception as e:
+                if is_retryable(e):
+                    provider.fail()
+                elif not is_model_error(e):
+                    raise
+                error = e
+        raise error
+
+    def create(self, **kwargs):
+        """
+        chat.completions.create with failover. Non-streaming requests are coalesced.
+        """
+        if kwargs.get("stream"):
+            return self._create(kwargs)
+        key = json.dumps(kwargs, sort_keys=True, default=str)
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result(timeout=self.timeout)
+        try:
+            future.set_result(self._create(kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def complete(self, messages, model=None, temperature=None, max_tokens=None) -> str:
+        """
+        Return the reply text for a list of chat messages.
+        """
+        kwargs = {"messages": messages, "model": model}
+        kwargs["temperature"] = float(os.getenv("DEFAULT_TEMPERATURE", "0.7")) if temperature is None else temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        return self.create(**kwargs).choices[0].message.content
+
+    def client(self):
+        """
+        An object shaped like a Groq/OpenAI client (client.chat.completions.create)
+        that agents can use in place of their own.
+        """
+        return SimpleNamespace(chat=SimpleNamespace(completions=self))
+
+    def stats(self) -> dict:
+        return {
+            "coalesced": self.coalesced,
+            "providers": {
+                p.name: {"requests": p.requests, "failures": p.failures, "cooling_down": p.available_at > time.monotonic()}
+                for p in self.providers
+            }
+        }
+
+
+def attach_gateway(agent):
+    """
+    Point an agent's LLM client at the shared gateway. Agents without a `client`
+    attribute are returned unchanged, and so are all agents when no provider is
+    configured: they keep calling the LLM with their own client.
+    """
+    if hasattr(agent, "client"):
+        try:
+            agent.client = get_llm_gateway().client()
+        except ValueError as e:
+            global _gateway_warned
+            if not _gateway_warned:
+                _gateway_warned = True
+                logger.warning("Agents keep their own LLM clients: %s", e)
+    return agent
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+_gateway_warned = False
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Return the process-wide gateway. LLM_PROVIDERS lists providers in failover
+    order (default "groq,openai"); set it to "fake" for offline tests.
+    Providers without an API key are skipped. GROQ_MODELS and OPENAI_MODELS list
+    the models each provider serves besides its default.
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            names = [n.strip() for n in os.getenv("LLM_PROVIDERS", "groq,openai").split(",") if n.strip()]
+            names = [n for n in names if n == "fake" or os.getenv(f"{n.upper()}_API_KEY")]
+            if not names:
+                raise ValueError("No LLM provider configured: set GROQ_API_KEY or OPENAI_API_KEY, or LLM_PROVIDERS=fake")
+            _gateway = LLMGateway(
+                (PROVIDERS[name]() for name in names), timeout=float(os.getenv("LLM_TIMEOUT", "60"))
+            )
+        return _gateway
@@ -0,0 +1,64 @@
+# pacing.py
+# Pacing of UI transitions for Indian Court Simulator
+
+import os
+import textwrap
+import time
+
+import streamlit as st
+
+PACING_MODES = ("server", "client", "production")
+
+TRANSITION_CSS = """
+<style>
+    @keyframes transitionIn { from { opacity: 0; } to { opacity: 1; } }
+    @keyframes transitionOut { to { opacity: 0; max-height: 0; margin: 0; padding: 0; } }
+</style>
+"""
+
+
+class Pacer:
+    """
+    Replaces blocking "for effect" sleeps in button handlers.
+
+    - server: show the transition and sleep, as the app originally did
+    - client: queue the transition and rerun at once; the next render shows it
+      and the browser removes it after the same delay
+    - production: skip transitions and delays entirely
+
+    The mode comes from the PACING_MODE environment variable (default: client).
+    """
+    def __init__(self, mode: str = None):
+        self.mode = mode or os.getenv("PACING_MODE", "client")
+        if self.mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode {self.mode!r}, expected one of {PACING_MODES}")
+
+    def transition(self, html: str, seconds: float):
+        """
+        Show `html` for `seconds` before the page moves on.
+        """
+        if self.mode == "server":
+            st.markdown(html, unsafe_allow_html=True)
+            time.sleep(seconds)
+        elif self.mode == "client":
+            st.session_state.setdefault("pending_transitions", []).append((html, seconds))
+
+    def pause(self, seconds: float):
+        """
+        A bare delay with nothing to show; only server mode waits.
+        """
+        if self.mode == "server":
+            time.sleep(seconds)
+
+    def render_pending(self):
+        """
+        Show transitions queued before the last rerun, each fading out in the browser.
+        """
+        pending = st.session_state.pop("pending_transitions", None)
+        if not pending:
+            return
+        st.markdown(TRANSITION_CSS + "".join(
+            f"<div style='overflow:hidden;max-height:600px;animation:transitionIn 0.3s, "
+            f"transitionOut 0.4s ease-in {seconds}s forwards;'>{textwrap.dedent(html).strip()}</div>"
+            for html, seconds in pending
+        ), unsafe_allow_html=True)
@@ -0,0 +1,188 @@
+# response_cache.py
+# Response cache for LLM-backed courtroom agents
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def _normalize(value):
+    """
+    Collapse insignificant whitespace in prompt strings so equivalent prompts share a key.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ResponseCache:
+    """
+    LRU cache of agent responses with a TTL, backed by an optional SQLite file
+    so entries survive restarts and are shared between processes.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: float = 24 * 3600, db_path: str = None,
+                 max_db_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(agent: str, method: str, model, temperature, prompt, case_id=None) -> str:
+        payload = {
+            "agent": agent,
+            "method": method,
+            "model": model,
+            "temperature": None if temperature is None else round(float(temperature), 3),
+            "prompt": _normalize(prompt),
+            "case_id": None if case_id is None else str(case_id)
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Return (found, value) for a key, counting the lookup as a hit or miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self._entries.pop(key, None)
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.hits += 1
+                    return True, value
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is not None:
+                try:
+                    encoded = json.dumps(value)
+                except TypeError:
+                    # Responses that are not plain JSON stay in memory only
+                    return
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, encoded, now, now)
+                )
+                self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_entries,)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value, created: float):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_call(self, key: str, fn, *args, **kwargs):
+        found, value = self.get(key)
+        if found:
+            return value
+        value = fn(*args, **kwargs)
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+
+def agent_identity(agent) -> str:
+    """
+    Identify an agent by its class and persona config, so different witnesses never share answers.
+    """
+    config = getattr(agent, "config", None)
+    return f"{type(agent).__name__}:{json.dumps(config, sort_keys=True, default=str)}"
+
+
+def agent_cache_key(cache: ResponseCache, agent, method: str, args=(), kwargs=None, case_id=None) -> str:
+    """
+    Build the cache key for an agent call.
+    The model and temperature come from the agent, falling back to the .env defaults.
+    """
+    model = getattr(agent, "model", None) or os.getenv("DEFAULT_MODEL")
+    temperature = getattr(agent, "temperature", None)
+    if temperature is None:
+        temperature = os.getenv("DEFAULT_TEMPERATURE")
+    return cache.make_key(agent_identity(agent), method, model, temperature, [list(args), kwargs or {}], case_id)
+
+
+def cached_agent_call(cache: ResponseCache, agent, method: str, *args, case_id=None, **kwargs):
+    """
+    Call agent.method(*args, **kwargs) through the cache.
+    """
+    key = agent_cache_key(cache, agent, method, args, kwargs, case_id)
+    return cache.get_or_call(key, getattr(agent, method), *args, **kwargs)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache, configured from the environment.
+    Set RESPONSE_CACHE_DB to also keep responses in a SQLite file.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+                ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600))),
+                db_path=os.getenv("RESPONSE_CACHE_DB") or None
+            )
+        return _cache
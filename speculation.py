@@ -0,0 +1,164 @@
+# speculation.py
+# Speculative pre-generation of the next agent turn for Indian Court Simulator
+
+import copy
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from agent_stream import stream_agent_call
+from response_cache import agent_identity
+
+
+def isolated_copy(agent):
+    """
+    Copy an agent so a speculative call cannot touch the original's state.
+    Attributes that cannot be deep-copied (clients, locks) are shared.
+    """
+    clone = copy.copy(agent)
+    for name, value in vars(agent).items():
+        try:
+            setattr(clone, name, copy.deepcopy(value))
+        except Exception:
+            pass
+    return clone
+
+
+class Speculation:
+    """
+    One speculative call running on an isolated copy of the agent. Its chunks are
+    buffered as they arrive so the reply can still be streamed once claimed.
+    """
+    def __init__(self, agent, method: str, args, kwargs):
+        self.agent = isolated_copy(agent)
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.chunks = []
+        self.error = None
+        self.done = False
+        self.future = None
+        self._changed = threading.Condition()
+
+    def run(self):
+        try:
+            for chunk in stream_agent_call(self.agent, self.method, *self.args, **self.kwargs):
+                with self._changed:
+                    self.chunks.append(chunk)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    def stream(self, timeout: float = None):
+        """
+        Yield the reply's chunks: those already generated at once, then the rest as they come.
+        """
+        index = 0
+        while True:
+            with self._changed:
+                if index == len(self.chunks) and not self.done:
+                    if not self._changed.wait(timeout):
+                        raise TimeoutError("Speculative call produced no output in time")
+                chunks, done = self.chunks[index:], self.done
+            for chunk in chunks:
+                yield chunk
+            index += len(chunks)
+            if done and index == len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class Speculator:
+    """
+    Starts the agent call the user is most likely to trigger next (e.g. the witness
+    answer to the question being typed) in the background.
+
+    Speculative calls run on an isolated copy of the agent and write nowhere, so a
+    discarded speculation leaves no trace. A claimed one hands back its copy, which
+    now holds the conversation state including this turn, for the caller to adopt
+    in place of the original.
+    """
+    def __init__(self, executor: ThreadPoolExecutor = None, max_pending: int = 2):
+        self.executor = executor or get_speculation_executor()
+        self.max_pending = max_pending
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(agent, method, args, kwargs):
+        return json.dumps([agent_identity(agent), id(agent), method, list(args), kwargs], sort_keys=True, default=str)
+
+    def speculate(self, agent, method: str, *args, **kwargs):
+        """
+        Begin agent.method(*args, **kwargs) in the background unless it is already
+        running. Older speculations beyond max_pending are discarded.
+        """
+        key = self._key(agent, method, args, kwargs)
+        with self._lock:
+            if key in self._pending:
+                return key
+            while len(self._pending) >= self.max_pending:
+                self._discard(next(iter(self._pending)))
+            speculation = Speculation(agent, method, args, kwargs)
+            speculation.future = self.executor.submit(speculation.run)
+            self._pending[key] = speculation
+            self.started += 1
+        return key
+
+    def claim(self, agent, method: str, *args, **kwargs):
+        """
+        Return the speculation matching this call, if any, discarding the rest.
+        Failed speculations are not returned, so the caller makes the call itself.
+        """
+        key = self._key(agent, method, args, kwargs)
+        with self._lock:
+            speculation = self._pending.pop(key, None)
+            for other in list(self._pending):
+                self._discard(other)
+            if speculation is None or speculation.error is not None:
+                return None
+            self.used += 1
+        return speculation
+
+    def discard_all(self):
+        with self._lock:
+            for key in list(self._pending):
+                self._discard(key)
+
+    def _discard(self, key):
+        self._pending.pop(key).future.cancel()
+        self.discarded += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "used": self.used,
+                "discarded": self.discarded,
+                "pending": len(self._pending)
+            }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_speculation_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide pool speculative calls run on (SPECULATION_WORKERS threads).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SPECULATION_WORKERS", "4")), thread_name_prefix="speculation"
+            )
+        return _executor
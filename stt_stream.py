@@ -0,0 +1,119 @@
+# stt_stream.py
+# Streaming speech-to-text for Indian Court Simulator
+
+import queue
+import threading
+
+_END = object()
+
+
+def microphone_chunks(recognizer=None, chunk_seconds: float = 4.0, silence_timeout: float = 2.0):
+    """
+    Yield speech_recognition AudioData chunks of at most `chunk_seconds` from the
+    default microphone, stopping once nobody has spoken for `silence_timeout` seconds.
+    """
+    import speech_recognition as sr
+
+    recognizer = recognizer or sr.Recognizer()
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        while True:
+            try:
+                yield recognizer.listen(source, timeout=silence_timeout, phrase_time_limit=chunk_seconds)
+            except sr.WaitTimeoutError:
+                return
+
+
+def google_transcriber(recognizer=None, language: str = "en-IN"):
+    """
+    Return a function transcribing one AudioData chunk with Google's recognizer,
+    giving "" for chunks without intelligible speech.
+    """
+    import speech_recognition as sr
+
+    recognizer = recognizer or sr.Recognizer()
+
+    def transcribe(audio) -> str:
+        try:
+            return recognizer.recognize_google(audio, language=language)
+        except sr.UnknownValueError:
+            return ""
+    return transcribe
+
+
+class StreamingTranscriber:
+    """
+    Transcribes speech while it is still being captured.
+
+    A capture thread reads chunks from `chunks` and hands them to a transcription
+    thread, so chunk N is transcribed while chunk N+1 is recorded. Partial text is
+    published after every chunk and the final text is ready as soon as the last
+    chunk (the one ending in silence) has been transcribed.
+    """
+    def __init__(self, chunks, transcribe, max_pending: int = 8):
+        self.pieces = []
+        self.error = None
+        self._chunks = chunks
+        self._transcribe = transcribe
+        self._audio = queue.Queue(maxsize=max_pending)
+        self._updates = queue.Queue()
+        self._done = threading.Event()
+        threading.Thread(target=self._capture, daemon=True).start()
+        threading.Thread(target=self._recognize, daemon=True).start()
+
+    @classmethod
+    def from_microphone(cls, language: str = "en-IN", chunk_seconds: float = 4.0, silence_timeout: float = 2.0):
+        return cls(
+            microphone_chunks(chunk_seconds=chunk_seconds, silence_timeout=silence_timeout),
+            google_transcriber(language=language)
+        )
+
+    def _capture(self):
+        try:
+            for chunk in self._chunks:
+                self._audio.put(chunk)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._audio.put(_END)
+
+    def _recognize(self):
+        while True:
+            chunk = self._audio.get()
+            if chunk is _END:
+                break
+            try:
+                piece = self._transcribe(chunk).strip()
+            except Exception as e:
+                self.error = e
+                continue
+            if piece:
+                self.pieces.append(piece)
+                self._updates.put(self.text)
+        self._done.set()
+        self._updates.put(_END)
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.pieces)
+
+    def partials(self):
+        """
+        Yield the growing transcript after each recognized chunk until speech ends.
+        """
+        while True:
+            update = self._updates.get()
+            if update is _END:
+                return
+            yield update
+
+    def result(self, timeout: float = None) -> str:
+        """
+        Wait for speech to end and return the full transcript.
+        """
+        self._done.wait(timeout)
+        return self.text
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
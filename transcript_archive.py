@@ -0,0 +1,234 @@
+# transcript_archive.py
+# Indexed archive of saved trial transcripts for Indian Court Simulator
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+SUMMARY_CHARS = 200
+
+
+def _summary(entries) -> str:
+    """
+    A short preview for listings: the last judgment if there is one, else the last entry.
+    """
+    for entry in reversed(entries):
+        if "judgment" in str(entry.get("content", "")).lower():
+            break
+    else:
+        entry = entries[-1] if entries else {}
+    text = f"{entry.get('speaker', '')}: {entry.get('content', '')}" if entry else ""
+    return text[:SUMMARY_CHARS]
+
+
+class TranscriptArchive:
+    """
+    Saved transcripts in SQLite. Listings read only the metadata table (indexed by
+    user, case and date), entries are fetched a page at a time, and an FTS5 index
+    over speaker and content serves full-text search.
+    """
+    def __init__(self, db_path: str = "data/transcripts.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS transcripts (
+                id INTEGER PRIMARY KEY,
+                username TEXT,
+                case_id TEXT,
+                case_title TEXT,
+                user_role TEXT,
+                saved_at REAL NOT NULL,
+                date TEXT NOT NULL,
+                entry_count INTEGER NOT NULL,
+                summary TEXT
+            );
+            CREATE INDEX IF NOT EXISTS transcripts_user ON transcripts (username, saved_at);
+            CREATE INDEX IF NOT EXISTS transcripts_case ON transcripts (case_id, saved_at);
+            CREATE INDEX IF NOT EXISTS transcripts_date ON transcripts (date, saved_at);
+            CREATE TABLE IF NOT EXISTS entries (
+                transcript_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                speaker TEXT,
+                content TEXT,
+                PRIMARY KEY (transcript_id, seq)
+            ) WITHOUT ROWID;
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+                speaker, content, transcript_id UNINDEXED, seq UNINDEXED
+            );
+        """)
+        db.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=10)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def save(self, username: str, transcript_data: dict, saved_at: float = None) -> int:
+        """
+        Store a transcript in the format app.py saves
+        ({case_id, case_title, date, user_role, transcript}) and return its id.
+        """
+        entries = [e for e in transcript_data.get("transcript", []) if isinstance(e, dict)]
+        saved_at = saved_at or time.time()
+        date = str(transcript_data.get("date") or datetime.fromtimestamp(saved_at).strftime("%Y-%m-%d %H:%M:%S"))
+        rows = [(i, e.get("speaker", ""), str(e.get("content", ""))) for i, e in enumerate(entries)]
+        db = self._connection()
+        with db:
+            cursor = db.execute(
+                "INSERT INTO transcripts (username, case_id, case_title, user_role, saved_at, date, entry_count, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    username, str(transcript_data.get("case_id", "")), transcript_data.get("case_title"),
+                    transcript_data.get("user_role"), saved_at, date, len(entries), _summary(entries)
+                )
+            )
+            transcript_id = cursor.lastrowid
+            db.executemany(
+                "INSERT INTO entries (transcript_id, seq, speaker, content) VALUES (?, ?, ?, ?)",
+                [(transcript_id, seq, speaker, content) for seq, speaker, content in rows]
+            )
+            db.executemany(
+                "INSERT INTO entries_fts (speaker, content, transcript_id, seq) VALUES (?, ?, ?, ?)",
+                [(speaker, content, transcript_id, seq) for seq, speaker, content in rows]
+            )
+        return transcript_id
+
+    @staticmethod
+    def _filters(username=None, case_id=None, date_from=None, date_to=None):
+        clauses, params = [], []
+        if username is not None:
+            clauses.append("username = ?")
+            params.append(username)
+        if case_id is not None:
+            clauses.append("case_id = ?")
+            params.append(str(case_id))
+        if date_from is not None:
+            clauses.append("date >= ?")
+            params.append(str(date_from))
+        if date_to is not None:
+            # Compare only as much of the stored timestamp as date_to gives, so a bare day is inclusive
+            clauses.append("substr(date, 1, ?) <= ?")
+            params.extend([len(str(date_to)), str(date_to)])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def summaries(self, username=None, case_id=None, date_from=None, date_to=None, limit: int = 20, offset: int = 0):
+        """
+        Newest-first metadata summaries (no entry bodies), filtered by user, case
+        and/or date range ("YYYY-MM-DD").
+        """
+        where, params = self._filters(username, case_id, date_from, date_to)
+        rows = self._connection().execute(
+            f"SELECT * FROM transcripts{where} ORDER BY saved_at DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, username=None, case_id=None, date_from=None, date_to=None) -> int:
+        where, params = self._filters(username, case_id, date_from, date_to)
+        return self._connection().execute(f"SELECT COUNT(*) FROM transcripts{where}", params).fetchone()[0]
+
+    def get(self, transcript_id: int):
+        row = self._connection().execute("SELECT * FROM transcripts WHERE id = ?", (transcript_id,)).fetchone()
+        return dict(row) if row else None
+
+    def entries(self, transcript_id: int, offset: int = 0, limit: int = 100):
+        """
+        One page of a transcript's entries, in order.
+        """
+        rows = self._connection().execute(
+            "SELECT speaker, content FROM entries WHERE transcript_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+            (transcript_id, offset, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export(self, transcript_id: int):
+        """
+        The full transcript in the same shape it was saved in.
+        """
+        meta = self.get(transcript_id)
+        if meta is None:
+            return None
+        return {
+            "case_id": meta["case_id"],
+            "case_title": meta["case_title"],
+            "date": meta["date"],
+            "user_role": meta["user_role"],
+            "transcript": self.entries(transcript_id, 0, -1)
+        }
+
+    def search(self, query: str, username=None, limit: int = 20):
+        """
+        Full-text search over speakers and content, best matches first. Each hit
+        carries the transcript's metadata plus the matching entry and a snippet.
+        """
+        # Quote every term so user input is never parsed as FTS5 syntax
+        match = " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+        if not match:
+            return []
+        sql = (
+            "SELECT t.*, f.seq AS seq, f.speaker AS speaker, "
+            "snippet(entries_fts, 1, '**', '**', '…', 12) AS snippet "
+            "FROM entries_fts f JOIN transcripts t ON t.id = f.transcript_id "
+            "WHERE entries_fts MATCH ?"
+        )
+        params = [match]
+        if username is not None:
+            sql += " AND t.username = ?"
+            params.append(username)
+        sql += " ORDER BY f.rank LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connection().execute(sql, params).fetchall()]
+
+    def import_directory(self, root: str = "data/transcripts") -> int:
+        """
+        Import JSON transcripts saved as <root>/<username>/<file>.json before the
+        archive existed. Returns the number imported.
+        """
+        imported = 0
+        if not os.path.isdir(root):
+            return imported
+        for username in sorted(os.listdir(root)):
+            user_dir = os.path.join(root, username)
+            if not os.path.isdir(user_dir):
+                continue
+            for filename in sorted(os.listdir(user_dir)):
+                path = os.path.join(user_dir, filename)
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(path, "r") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if isinstance(data, list):
+                    data = {"transcript": data}
+                self.save(username, data, saved_at=os.path.getmtime(path))
+                imported += 1
+        return imported
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_transcript_archive(db_path: str = None) -> TranscriptArchive:
+    """
+    Return the process-wide archive (TRANSCRIPT_DB, default data/transcripts.db).
+    A new archive first imports any JSON files under data/transcripts, once.
+    """
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = TranscriptArchive(db_path or os.getenv("TRANSCRIPT_DB", "data/transcripts.db"))
+            if _archive.count() == 0:
+                _archive.import_directory()
+        return _archive
@@ -0,0 +1,98 @@
+# transcript_store.py
+# Append-only, indexed transcript log for Indian Court Simulator
+
+from collections import Counter, defaultdict
+
+# Checked in order; the first marker found in an entry's content decides its event type
+EVENT_MARKERS = [
+    ('judgment', 'Final Judgment'),
+    ('closing', 'Closing Argument:'),
+    ('objection', 'Objection!'),
+    ('question', 'Question to'),
+    ('evidence', 'Presenting evidence:'),
+]
+
+
+def classify_entry(content: str) -> str:
+    """
+    Return the event type of a transcript entry from its content.
+    """
+    for event, marker in EVENT_MARKERS:
+        if marker in content:
+            return event
+    return 'statement'
+
+
+class TranscriptStore:
+    """
+    Keeps transcript entries in write order together with indexes by
+    speaker, phase and event type, so consumers never rescan content.
+    """
+    def __init__(self):
+        self.entries = []
+        self.by_speaker = defaultdict(list)
+        self.by_phase = defaultdict(list)
+        self.by_event = defaultdict(list)
+        self.counts = Counter()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, entry: dict, phase: str = None) -> dict:
+        """
+        Tag an entry with its event type and phase and add it to the indexes.
+        """
+        entry = dict(entry)
+        entry.setdefault('event', classify_entry(entry.get('content', '')))
+        if phase is not None:
+            entry.setdefault('phase', phase)
+        index = len(self.entries)
+        self.entries.append(entry)
+        self.by_speaker[entry.get('speaker')].append(index)
+        self.by_phase[entry.get('phase')].append(index)
+        self.by_event[entry['event']].append(index)
+        self.counts[entry['event']] += 1
+        self.counts[(entry['event'], entry.get('speaker'))] += 1
+        return entry
+
+    def sync(self, transcript: list, phase: str = None):
+        """
+        Ingest entries of an append-only transcript that are not stored yet.
+        """
+        for entry in transcript[len(self.entries):]:
+            if isinstance(entry, dict) and 'speaker' in entry:
+                self.append(entry, phase)
+            else:
+                # Keep indexes aligned with the source transcript
+                self.entries.append(entry)
+        return self.entries
+
+    def count(self, event: str, speaker: str = None) -> int:
+        if speaker is None:
+            return self.counts[event]
+        return self.counts[(event, speaker)]
+
+    def last(self, event: str):
+        """
+        Return the most recent entry of an event type, or None.
+        """
+        indices = self.by_event.get(event)
+        return self.entries[indices[-1]] if indices else None
+
+    def recent(self, event: str, within: int) -> list:
+        """
+        Return entries of an event type among the last `within` entries.
+        """
+        cutoff = len(self.entries) - within
+        result = []
+        for index in reversed(self.by_event.get(event, [])):
+            if index < cutoff:
+                break
+            result.append(self.entries[index])
+        return result[::-1]
+
+    def for_speaker(self, speaker: str) -> list:
+        return [self.entries[i] for i in self.by_speaker.get(speaker, [])]
+
+    def for_phase(self, phase: str) -> list:
+        return [self.entries[i] for i in self.by_phase.get(phase, [])]
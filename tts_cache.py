@@ -0,0 +1,327 @@
+# tts_cache.py
+# Content-addressed audio cache for Indian Court Simulator speech output
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+# Prompts the courtroom speaks before every recording; synthesized once at startup
+STATIC_PROMPTS = (
+    "Please deliver your opening statement.",
+    "Please ask your question.",
+    "Please provide your testimony.",
+    "Please explain the significance of this evidence.",
+    "Please deliver your closing argument.",
+    "Please deliver your judgment.",
+)
+
+
+class AudioCache:
+    """
+    Synthesized audio keyed by (text, voice, language, speed), kept as files in a
+    cache directory with an in-memory LRU of the most recently used clips in front.
+    """
+    def __init__(self, cache_dir: str = "data/tts_cache", max_entries: int = 256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, voice: str, language: str, speed: float, source: str = "gtts") -> str:
+        payload = {
+            "source": source,
+            "text": " ".join(text.split()),
+            "voice": voice,
+            "language": language,
+            "speed": round(float(speed), 3)
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def get(self, key: str):
+        """
+        Return the cached audio bytes for a key, or None.
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+        try:
+            with open(self.path_for(key), "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(key, audio)
+            self.hits += 1
+        return audio
+
+    def set(self, key: str, audio: bytes):
+        path = self.path_for(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._remember(key, audio)
+
+    def _remember(self, key: str, audio: bytes):
+        self._entries[key] = audio
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+
+def split_sentences(text: str, max_chars: int = 250):
+    """
+    Split text into sentence-sized chunks for synthesis, merging short sentences
+    and breaking long ones at commas or spaces. The split is deterministic, so the
+    same text always produces the same chunks (and the same cache keys).
+    """
+    chunks = []
+    for sentence in re.split(r"(?<=[.!?;:])\s+", " ".join(text.split())):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(", ", 0, max_chars)
+            if cut > 0:
+                # Keep the comma with the first part
+                cut += 1
+            else:
+                cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if chunks and len(chunks[-1]) + len(sentence) < max_chars // 2:
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        elif sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+AUDIO_PLAYLIST = """
+<audio id="player" controls style="width:100%%;"></audio>
+<script>
+    const playlist = %(playlist)s;
+    const player = document.getElementById("player");
+    // The player is re-rendered as chunks arrive; its position survives in sessionStorage
+    const key = "court-audio-" + playlist.id;
+    let state = {index: 0, time: 0};
+    try { state = JSON.parse(sessionStorage.getItem(key)) || state; } catch (e) {}
+
+    function save() {
+        try { sessionStorage.setItem(key, JSON.stringify(state)); } catch (e) {}
+    }
+
+    function load(index, time) {
+        state.index = index;
+        state.time = time;
+        player.src = playlist.sources[index];
+        player.addEventListener("loadedmetadata", () => { player.currentTime = time; }, {once: true});
+        player.play().catch(() => {});
+    }
+
+    player.ontimeupdate = () => { state.time = player.currentTime; save(); };
+    player.onended = () => {
+        state.index += 1;
+        state.time = 0;
+        save();
+        // Past the last chunk so far: the next render resumes here
+        if (state.index < playlist.sources.length) load(state.index, 0);
+    };
+    if (state.index < playlist.sources.length) load(state.index, state.time);
+</script>
+"""
+
+
+def play_in_browser(chunks, height: int = 60):
+    """
+    Play MP3 chunks in the browser, in order, through one audio player that
+    starts with the first chunk and picks up later ones as they arrive.
+    """
+    import base64
+    import uuid
+
+    import streamlit as st
+    import streamlit.components.v1 as components
+
+    placeholder = st.empty()
+    playlist = {"id": uuid.uuid4().hex, "sources": []}
+    for audio in chunks:
+        playlist["sources"].append("data:audio/mp3;base64," + base64.b64encode(audio).decode("ascii"))
+        with placeholder:
+            components.html(AUDIO_PLAYLIST % {"playlist": json.dumps(playlist)}, height=height)
+
+
+def synthesize_gtts(text: str, voice: str, language: str, speed: float) -> bytes:
+    """
+    Synthesize MP3 audio with gTTS. The voice selects the accent (Google domain)
+    and speeds below 1 use gTTS's slow mode.
+    """
+    from gtts import gTTS
+
+    buf = BytesIO()
+    gTTS(text=text, lang=language, tld=voice, slow=speed < 1).write_to_fp(buf)
+    return buf.getvalue()
+
+
+class CachedTTSEngine:
+    """
+    Wraps a TTSEngine so repeated prompts are served from the audio cache
+    instead of being synthesized again. TTSEngine can only speak, not hand back
+    audio, so speech is always synthesized with `synthesize` (gTTS by default)
+    and played from the cache. Other engine attributes pass through.
+    """
+    def __init__(self, engine=None, cache: AudioCache = None, voice: str = "co.in",
+                 language: str = "en", speed: float = 1.0, synthesize=synthesize_gtts):
+        self.engine = engine
+        self.cache = cache or get_audio_cache()
+        self.voice = voice
+        self.language = language
+        self.speed = speed
+        self._synthesize = synthesize
+
+    def _key(self, text, voice, language, speed):
+        return self.cache.make_key(
+            text,
+            voice or self.voice,
+            language or self.language,
+            self.speed if speed is None else speed,
+            getattr(self._synthesize, "__name__", "custom")
+        )
+
+    def synthesize(self, text: str, voice: str = None, language: str = None, speed: float = None) -> bytes:
+        """
+        Return MP3 bytes for `text`, synthesizing only on a cache miss.
+        """
+        key = self._key(text, voice, language, speed)
+        audio = self.cache.get(key)
+        if audio is None:
+            audio = self._synthesize(
+                text, voice or self.voice, language or self.language, self.speed if speed is None else speed
+            )
+            self.cache.set(key, audio)
+        return audio
+
+    def audio_path(self, text: str, voice: str = None, language: str = None, speed: float = None) -> str:
+        """
+        Return the path of the cached MP3 for `text`, synthesizing it first if needed.
+        """
+        self.synthesize(text, voice, language, speed)
+        return self.cache.path_for(self._key(text, voice, language, speed))
+
+    def speak(self, text: str, voice: str = None, language: str = None, speed: float = None):
+        """
+        Play `text` aloud from the cached audio file.
+        """
+        from playsound import playsound
+
+        playsound(self.audio_path(text, voice, language, speed))
+
+    def synthesize_ahead(self, text: str, voice: str = None, language: str = None, speed: float = None):
+        """
+        Yield (chunk text, MP3 bytes) for each sentence chunk of `text`, in order.
+        Chunks are synthesized in parallel, so the first one is ready after a
+        single sentence however long the text is.
+        """
+        executor = get_synthesis_executor()
+        futures = [
+            (chunk, executor.submit(self.synthesize, chunk, voice, language, speed))
+            for chunk in split_sentences(text)
+        ]
+        try:
+            for chunk, future in futures:
+                yield chunk, future.result()
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def stream(self, text: str, voice: str = None, language: str = None, speed: float = None):
+        """
+        Yield MP3 bytes for `text` one sentence chunk at a time.
+        """
+        for _, audio in self.synthesize_ahead(text, voice, language, speed):
+            yield audio
+
+    def speak_stream(self, text: str, voice: str = None, language: str = None, speed: float = None):
+        """
+        Play long text aloud, starting as soon as its first sentence is synthesized.
+        """
+        from playsound import playsound
+
+        for chunk, _ in self.synthesize_ahead(text, voice, language, speed):
+            playsound(self.audio_path(chunk, voice, language, speed))
+
+    def presynthesize(self, prompts=STATIC_PROMPTS):
+        """
+        Synthesize every prompt that is not cached yet. Failures (e.g. no network)
+        are left for speak() to retry.
+        """
+        for text in prompts:
+            try:
+                self.synthesize(text)
+            except Exception:
+                continue
+
+    def __getattr__(self, name):
+        engine = self.__dict__.get("engine")
+        if engine is None:
+            raise AttributeError(name)
+        return getattr(engine, name)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_executor = None
+
+
+def get_audio_cache() -> AudioCache:
+    """
+    Return the process-wide audio cache, configured from the environment
+    (TTS_CACHE_DIR, TTS_CACHE_SIZE).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache(
+                cache_dir=os.getenv("TTS_CACHE_DIR", "data/tts_cache"),
+                max_entries=int(os.getenv("TTS_CACHE_SIZE", "256"))
+            )
+        return _cache
+
+
+def get_synthesis_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide pool synthesizing sentence chunks (TTS_WORKERS threads).
+    """
+    global _executor
+    with _cache_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("TTS_WORKERS", "4")), thread_name_prefix="tts"
+            )
+        return _executor
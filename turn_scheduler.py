@@ -0,0 +1,103 @@
+# turn_scheduler.py
+# Concurrent agent turns within a trial phase for Indian Court Simulator
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Turn:
+    def __init__(self, speaker, fn, args, kwargs, after, prefix):
+        self.speaker = speaker
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.after = after
+        self.prefix = prefix
+        self.content = None
+
+    @property
+    def line(self):
+        return f"{self.prefix}{self.content}" if self.prefix else self.content
+
+
+class TurnScheduler:
+    """
+    Runs the agent turns of one phase on asyncio, starting each turn as soon as the
+    turns it depends on have finished, so independent turns overlap.
+
+    Turns are reported in the order they were added, whatever order they finish in,
+    so the transcript keeps the script's order. A turn only sees earlier results
+    it lists in `after`.
+    """
+    def __init__(self, max_concurrency: int = 8, executor: ThreadPoolExecutor = None):
+        self.max_concurrency = max_concurrency
+        self.executor = executor or get_turn_executor()
+        self.turns = []
+
+    def add(self, speaker, fn, *args, after=(), prefix="", **kwargs) -> Turn:
+        """
+        Schedule fn(*args, *results of `after`, **kwargs) as a turn by `speaker`.
+        Turns in `after` must already have been added. `prefix` is prepended to the
+        reported content only; dependent turns receive the raw result.
+        """
+        turn = Turn(speaker, fn, args, kwargs, tuple(after), prefix)
+        self.turns.append(turn)
+        return turn
+
+    def say(self, speaker, content) -> Turn:
+        """
+        Schedule a fixed line that needs no agent call.
+        """
+        return self.add(speaker, lambda: content)
+
+    async def run_async(self, on_turn=None):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = {}
+
+        async def run_turn(turn):
+            results = [await tasks[dep] for dep in turn.after]
+            async with semaphore:
+                turn.content = await loop.run_in_executor(
+                    self.executor, lambda: turn.fn(*turn.args, *results, **turn.kwargs)
+                )
+            return turn.content
+
+        turns, self.turns = self.turns, []
+        for turn in turns:
+            tasks[turn] = asyncio.ensure_future(run_turn(turn))
+        try:
+            # Await in insertion order: each turn is reported once it and all earlier turns are done
+            for turn in turns:
+                await tasks[turn]
+                if on_turn:
+                    on_turn(turn.speaker, turn.line)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return [(turn.speaker, turn.line) for turn in turns]
+
+    def run(self, on_turn=None):
+        """
+        Run every scheduled turn and return [(speaker, content)] in the order added.
+        """
+        return asyncio.run(self.run_async(on_turn))
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_turn_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide pool agent calls run on (TURN_WORKERS threads).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("TURN_WORKERS", "32")), thread_name_prefix="turn"
+            )
+        return _executor
@@ -0,0 +1,133 @@
+# user_store.py
+# SQLite-backed user accounts for Indian Court Simulator
+
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PBKDF2_ITERATIONS = 200000
+
+
+def hash_password(password: str, salt: bytes = None, iterations: int = PBKDF2_ITERATIONS):
+    """
+    Return (hash, salt) for a password using salted PBKDF2-HMAC-SHA256.
+    """
+    salt = salt or os.urandom(16)
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations), salt
+
+
+class UserStore:
+    """
+    User accounts in a SQLite database in WAL mode, looked up by username through
+    its primary key index. Each thread reuses one connection.
+
+    Accounts still only in the old plain-text users.json are migrated one at a
+    time, at their first successful login, so no request ever hashes the whole file.
+    """
+    def __init__(self, db_path: str = "data/users.db", legacy_path: str = "data/users.json"):
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self._legacy = None
+        self._legacy_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "username TEXT PRIMARY KEY, password_hash BLOB NOT NULL, salt BLOB NOT NULL, "
+            "iterations INTEGER NOT NULL, created REAL NOT NULL)"
+        )
+        db.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=10)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _legacy_users(self) -> dict:
+        """
+        The old users.json ({username: {"password": ...}}), read once.
+        """
+        with self._legacy_lock:
+            if self._legacy is None:
+                try:
+                    with open(self.legacy_path, "r") as f:
+                        self._legacy = json.load(f)
+                except (OSError, ValueError):
+                    self._legacy = {}
+            return self._legacy
+
+    def create_user(self, username: str, password: str) -> bool:
+        """
+        Add a user; returns False if the username is already taken.
+        """
+        if username in self._legacy_users():
+            return False
+        return self._insert(username, password)
+
+    def _insert(self, username: str, password: str) -> bool:
+        password_hash, salt = hash_password(password)
+        db = self._connection()
+        try:
+            with db:
+                db.execute(
+                    "INSERT INTO users (username, password_hash, salt, iterations, created) VALUES (?, ?, ?, ?, ?)",
+                    (username, password_hash, salt, PBKDF2_ITERATIONS, time.time())
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def authenticate(self, username: str, password: str) -> bool:
+        row = self._connection().execute(
+            "SELECT password_hash, salt, iterations FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None:
+            return self._migrate(username, password)
+        password_hash, _ = hash_password(password, row[1], row[2])
+        return hmac.compare_digest(password_hash, row[0])
+
+    def _migrate(self, username: str, password: str) -> bool:
+        """
+        Check a login against users.json and, if it matches, move the account
+        into the database with a hashed password.
+        """
+        info = self._legacy_users().get(username)
+        if not isinstance(info, dict) or not hmac.compare_digest(
+            str(info.get("password", "")).encode("utf-8"), password.encode("utf-8")
+        ):
+            return False
+        # A concurrent login may have migrated it first; either way the password matched
+        self._insert(username, password)
+        return True
+
+    def exists(self, username: str) -> bool:
+        return username in self._legacy_users() or self._connection().execute(
+            "SELECT 1 FROM users WHERE username = ?", (username,)
+        ).fetchone() is not None
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_user_store(db_path: str = None) -> UserStore:
+    """
+    Return the process-wide user store (USER_DB, default data/users.db).
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore(db_path or os.getenv("USER_DB", "data/users.db"))
+        return _store